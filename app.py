@@ -1,10 +1,22 @@
 # ur own privaty AI, made by GitHub: https://github.com/PinkMath
+import os
 import json
+import time
 import uuid
-import requests
+import queue
+import threading
 from pathlib import Path
-from datetime import datetime
 from flask import Flask, render_template, request, Response, stream_with_context, session, jsonify
+from terminalAI.ai_core import metrics
+from terminalAI.ai_core.log_writer import LogWriter
+from terminalAI.ai_core.log_reader import LineIndex, LogDirectory, tail_text
+from terminalAI.ai_core.log_summary import LogChunks, REDUCE_PROMPT, map_reduce, ollama_chunk_summarizer
+from terminalAI.ai_core.context import ContextWindow, ollama_summarizer
+from terminalAI.ai_core.ollama_client import get_client, start_warmup
+from terminalAI.ai_core.response_cache import ResponseCache, cache_key, replay_lines
+from terminalAI.ai_core.scheduler import PRIORITY_CHAT, PRIORITY_LOG, FairScheduler, SchedulerFull
+from terminalAI.ai_core.session_store import open_session_store
+from terminalAI.ai_core.stream_pipeline import Accumulator, Coalescer, Sanitizer, chunk_content, decode_line
 
 # =====================================================
 # APP CONFIG
@@ -13,15 +25,71 @@ from flask import Flask, render_template, request, Response, stream_with_context
 app = Flask(__name__)
 app.secret_key = "ferret_secret_key_99"
 
-API_URL = "http://localhost:11434/api/chat"
+API_URL = os.environ.get("FERRET_OLLAMA_URL", "http://localhost:11434/api/chat")
+# Several Ollama servers: FERRET_OLLAMA_URLS=http://gpu1:11434/api/chat,http://gpu2:11434/api/chat
+API_URLS = [url.strip() for url in os.environ.get("FERRET_OLLAMA_URLS", API_URL).split(",") if url.strip()]
 MODEL = "deepseek-coder:6.7b"
 MAX_LOG_CHARS = 12000
+MAX_LOG_PAGE_LINES = 500
+# /log <file> --full: summarize every chunk, this many model calls at a time
+LOG_MAP_WORKERS = 4
+NUM_CTX = 8192
+CONTEXT_RESERVE_TOKENS = 1024
+
+# SSE coalescing: the first token goes out at once, then tokens are batched
+# into one event every SSE_FLUSH_MS or SSE_FLUSH_BYTES, whichever comes first
+SSE_FLUSH_MS = 50
+SSE_FLUSH_BYTES = 512
+
+# /metrics is always on; FERRET_TIMING_LOG=1 also prints one JSON timing line
+# per request to stderr
+TIMING_LOG = os.environ.get("FERRET_TIMING_LOG") == "1"
+if TIMING_LOG:
+    metrics.enable_timing_log()
+
+# Pooled keep-alive connections to Ollama, shared by every request thread
+HTTP_POOL_SIZE = 32
+CONNECT_TIMEOUT = 3.05
+
+# Model lifecycle: every request asks Ollama to keep the model loaded for
+# KEEP_ALIVE; at startup it is loaded in the background (FERRET_WARMUP=0 to
+# skip) and re-warmed during KEEP_WARM_HOURS so the first token never waits
+# for a cold load. /health reports whether it is in memory.
+KEEP_ALIVE = os.environ.get("FERRET_KEEP_ALIVE", "30m")
+WARMUP = os.environ.get("FERRET_WARMUP", "1") != "0"
+KEEP_WARM_HOURS = (8, 19)
+
+# A BackendPool: least-loaded routing with session stickiness, health probes
+# and retry on another server when a stream fails before its first token
+ollama = get_client(API_URLS, MODEL, pool_size=HTTP_POOL_SIZE, connect_timeout=CONNECT_TIMEOUT, keep_alive=KEEP_ALIVE)
+if WARMUP:
+    start_warmup(ollama, KEEP_WARM_HOURS)
+
+# Upstream admission: at most MAX_ACTIVE_GENERATIONS model streams at once
+# (OLLAMA_NUM_PARALLEL per server); the rest wait in a fair per-session queue where
+# chats go before /log analyses, and are turned away once the queue is full.
+# The queue lives in each process: asgi.py --workers N sets FERRET_WORKERS so
+# every worker admits its share (at least one stream each)
+WORKERS = max(1, int(os.environ.get("FERRET_WORKERS", "1")))
+MAX_ACTIVE_GENERATIONS = max(1, 2 * len(API_URLS) // WORKERS)
+MAX_QUEUED_REQUESTS = 32
+QUEUE_AGING_SECONDS = 30
+QUEUE_UPDATE_SECONDS = 1.0
+BUSY_RETRY_AFTER = 5
+BUSY_MESSAGE = "Ferret is busy with other requests. Please try again in a few seconds."
+scheduler = FairScheduler(MAX_ACTIVE_GENERATIONS, MAX_QUEUED_REQUESTS, QUEUE_AGING_SECONDS)
+metrics.QUEUED.fn = lambda: scheduler.stats()["queued"]
 
 # =====================================================
 # LOG DIRECTORY
 # =====================================================
 
 def get_log_directory() -> Path:
+    if os.environ.get("FERRET_LOG_DIR"):
+        log_dir = Path(os.environ["FERRET_LOG_DIR"])
+        log_dir.mkdir(parents=True, exist_ok=True)
+        return log_dir
+
     for base in (Path.home() / "OneDrive" / "Desktop", Path.home() / "Desktop"):
         if base.exists():
             log_dir = base / "logs_Ferret"
@@ -35,6 +103,13 @@ def get_log_directory() -> Path:
 
 LOG_DIR = get_log_directory()
 
+# Repeated /log analyses of an unchanged file are answered from here
+response_cache = ResponseCache(
+    cache_dir=LOG_DIR / "response_cache",
+    max_entries=256,
+    max_disk_bytes=128 * 1024 * 1024,
+)
+
 # =====================================================
 # DEFAULT SYSTEM MESSAGE
 # =====================================================
@@ -48,30 +123,89 @@ DEFAULT_SYSTEM_MESSAGE = {
 }
 
 # =====================================================
-# IN-MEMORY SESSION STORE
+# SESSION STORE
 # =====================================================
 
-sessions_db = {}
+# FERRET_SESSION_BACKEND:
+# "memory": per-process LRU + TTL, capped in count and size (default).
+# "sqlite": local file shared by several worker processes (FERRET_SESSION_DB).
+SESSION_BACKEND = os.environ.get("FERRET_SESSION_BACKEND", "memory")
+SESSION_TTL = 3600
+MAX_SESSIONS = 1000
+MAX_SESSION_BYTES = 64 * 1024 * 1024
+SESSION_DB = Path(os.environ.get("FERRET_SESSION_DB") or LOG_DIR / "sessions.sqlite3")
+
+if SESSION_BACKEND == "sqlite":
+    sessions = open_session_store("sqlite", DEFAULT_SYSTEM_MESSAGE, path=SESSION_DB, ttl=SESSION_TTL)
+else:
+    sessions = open_session_store(
+        "memory",
+        DEFAULT_SYSTEM_MESSAGE,
+        max_sessions=MAX_SESSIONS,
+        ttl=SESSION_TTL,
+        max_bytes=MAX_SESSION_BYTES,
+    )
+
+metrics.SESSIONS.fn = lambda: len(sessions)
+
+# Same client as the chat streams, so routing sees all upstream load
+summarizer = ollama_summarizer(model=MODEL, num_ctx=NUM_CTX, client=ollama)
+log_summarizer = ollama_chunk_summarizer(model=MODEL, num_ctx=NUM_CTX, client=ollama)
+
+
+def scheduled(summarize, sid: str, priority=PRIORITY_LOG, cancelled=None):
+    """``summarize`` with a scheduler slot per model call, so background work
+    (/log --full map/combine, context compaction) counts against
+    MAX_ACTIVE_GENERATIONS like a streamed reply does."""
+    def run(*args):
+        ticket = scheduler.submit(sid, priority)
+        try:
+            while not ticket.wait(QUEUE_UPDATE_SECONDS):
+                if cancelled is not None and cancelled.is_set():
+                    raise RuntimeError("analysis cancelled")
+            return summarize(*args)
+        finally:
+            ticket.release()
+    return run
+
+
+def get_context(sid: str) -> ContextWindow:
+    summary, summarized_upto = sessions.load_summary(sid)
+    return ContextWindow(
+        sessions.conversation(sid),
+        num_ctx=NUM_CTX,
+        reserve=CONTEXT_RESERVE_TOKENS,
+        summarizer=scheduled(summarizer, sid),
+        summary=summary,
+        summarized_upto=summarized_upto,
+        on_compact=lambda text, upto: sessions.save_summary(sid, text, upto),
+    )
 
 # =====================================================
 # LOGGING
 # =====================================================
 
+# Entries are queued and written in batches by a background thread;
+# files rotate daily and by size, old days are gzipped, then expired.
+log_writer = LogWriter(
+    LOG_DIR,
+    "chat_app",
+    separator="-" * 40,
+    on_batch=lambda seconds, entries: metrics.LOG_WRITE.observe(seconds),
+)
+
+
 def write_to_log(session_id: str, user_text: str, ai_text: str):
-    filename = f"chat_app_{datetime.now():%Y%m%d}.txt"
-    file_path = LOG_DIR / filename
-    timestamp = datetime.now().strftime("%H:%M:%S")
+    log_writer.write(user_text, ai_text)
+
 
-    with open(file_path, "a", encoding="utf-8") as f:
-        f.write(
-            f"[{timestamp}] USER: {user_text}\n"
-            f"[{timestamp}] AI: {ai_text}\n"
-            + "-" * 40 + "\n"
-        )
+# Reads only what /log asks for: a tail or a page of lines, never the whole file
+log_directory = LogDirectory(LOG_DIR)
+line_index = LineIndex()
 
 
-def read_log_file(filename: str):
-    if not filename.endswith(".txt"):
+def resolve_log_path(filename: str):
+    if not filename.endswith((".txt", ".txt.gz")):
         return None, "Only .txt files are allowed."
 
     safe_path = (LOG_DIR / filename).resolve()
@@ -82,105 +216,336 @@ def read_log_file(filename: str):
     if not safe_path.exists():
         return None, "Log file not found."
 
+    return safe_path, None
+
+
+def read_log_file(filename: str, start=None, count=None):
+    safe_path, error = resolve_log_path(filename)
+    if error:
+        return None, error
+
     try:
-        return safe_path.read_text(encoding="utf-8"), None
+        if start is None and count is None:
+            return tail_text(str(safe_path), MAX_LOG_CHARS), None
+        lines = line_index.read_lines(str(safe_path), start or 1, min(count or MAX_LOG_PAGE_LINES, MAX_LOG_PAGE_LINES))
+        if not lines:
+            return None, "No lines in that range."
+        return "".join(lines)[-MAX_LOG_CHARS:], None
     except Exception as e:
         return None, str(e)
 
+
+def parse_log_args(parts):
+    """Split ``/log`` arguments into ``(filename, start, count)``."""
+    filename, start, count = [], None, None
+    i = 0
+    while i < len(parts):
+        if parts[i] in ("--from", "--lines") and i + 1 < len(parts):
+            value = int(parts[i + 1])
+            if parts[i] == "--from":
+                start = value
+            else:
+                count = max(value, 1)
+            i += 2
+            continue
+        filename.append(parts[i])
+        i += 1
+    return " ".join(filename), start, count
+
 # =====================================================
 # SESSION MANAGEMENT
 # =====================================================
 
+def init_session(sid: str):
+    sessions.ensure(sid)
+
+
+# Sessions with a summarization running. Each request builds its own
+# ContextWindow, so the window's in-flight guard can't see the others.
+compacting = set()
+compacting_lock = threading.Lock()
+
+
+def compact_session(sid: str):
+    try:
+        get_context(sid).compact()
+    finally:
+        with compacting_lock:
+            compacting.discard(sid)
+
+
+def finish_turn(sid: str, user_input: str, full_response: str):
+    sessions.append(sid, {"role": "assistant", "content": full_response})
+    write_to_log(sid, user_input, full_response)
+    # Summarize older turns in the background before the next request
+    with compacting_lock:
+        if sid in compacting:
+            return
+        compacting.add(sid)
+    threading.Thread(target=compact_session, args=(sid,), daemon=True).start()
+
+
 @app.before_request
 def ensure_session():
+    if request.endpoint in ("metrics_endpoint", "health", "static"):
+        return  # probes, scrapers and assets don't need a chat session
+
     if "sid" not in session:
         session["sid"] = str(uuid.uuid4())
 
-    if session["sid"] not in sessions_db:
-        sessions_db[session["sid"]] = [DEFAULT_SYSTEM_MESSAGE.copy()]
+    init_session(session["sid"])
 
 # =====================================================
 # MODEL STREAMING (REUSABLE)
 # =====================================================
 
-def stream_model(messages, timeout=30, save_to_session=False, sid=None, user_input=None):
+def admit(sid: str, priority: int, endpoint: str, started: float, notify=None):
+    """A scheduler ticket for one upstream generation, or None when the queue is full."""
+    try:
+        return scheduler.submit(sid, priority, notify)
+    except SchedulerFull:
+        metrics.record_request(endpoint, "rejected", started)
+        return None
+
+
+def busy_reply():
+    response = jsonify({"error": BUSY_MESSAGE})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(BUSY_RETRY_AFTER)
+    return response
+
+
+_LINES_DONE = object()
+
+
+def timed_lines(lines, coalescer):
+    # Yields upstream lines, or None when batched text is due but the model is
+    # still quiet, so a pause never holds back tokens we already have. Lines
+    # are read on a helper thread; closing the response ends it.
+    inbox = queue.Queue()
+
+    def read():
+        try:
+            for line in lines:
+                inbox.put(line)
+        except Exception as e:
+            inbox.put(e)
+        finally:
+            inbox.put(_LINES_DONE)
+
+    threading.Thread(target=read, name="sse-reader", daemon=True).start()
+    while True:
+        try:
+            item = inbox.get(timeout=coalescer.due_in())
+        except queue.Empty:
+            yield None
+            continue
+        if item is _LINES_DONE:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+def stream_model(messages, timeout=30, save_to_session=False, sid=None, user_input=None,
+                 cached=None, cache_id=None, prepare=None, endpoint="chat", started=None, ticket=None):
+    """``prepare``: optional generator yielding progress dicts and returning the messages.
+
+    ``ticket``: the request's scheduler slot; it is held for the whole stream
+    and released when the stream ends or the client disconnects.
+    """
+    started = started or time.perf_counter()
+
     @stream_with_context
     def generate():
-        full_response = ""
+        nonlocal messages, ticket
+        reply = Accumulator()
+        sanitizer = Sanitizer()
+        coalescer = Coalescer(SSE_FLUSH_MS / 1000, SSE_FLUSH_BYTES)
+        timer = metrics.RequestTimer(endpoint, cached=cached is not None, started=started)
+        response = None
 
         try:
-            response = requests.post(
-                API_URL,
-                json={"model": MODEL, "messages": messages, "stream": True},
-                stream=True,
-                timeout=timeout,
-            )
-            response.raise_for_status()
-
-            for line in response.iter_lines():
-                if not line:
-                    continue
-
-                try:
-                    chunk = json.loads(line.decode("utf-8"))
-                    content = chunk.get("message", {}).get("content", "")
-
+            if ticket is not None:
+                yield from queue_events(ticket)
+                metrics.QUEUE_WAIT.observe(ticket.waited, endpoint=endpoint)
+
+            if cached is not None:
+                lines = replay_lines(cached)
+            else:
+                if prepare is not None:
+                    # The map phase takes slots per model call: don't hold one meanwhile
+                    if ticket is not None:
+                        ticket.release()
+                    messages = yield from progress_events(prepare)
+                    if ticket is not None:
+                        ticket = scheduler.submit(ticket.sid, ticket.priority)
+                        yield from queue_events(ticket)
+                response = ollama.chat(messages, options={"num_ctx": NUM_CTX}, read_timeout=timeout, sid=sid)
+                lines = response.iter_lines()
+
+            for line in timed_lines(lines, coalescer):
+                if line is None:
+                    batch = coalescer.flush()
+                else:
+                    chunk = decode_line(line)
+                    if chunk is None:
+                        continue
+                    content = chunk_content(chunk)
                     if content:
-                        content = content.replace("![", "").replace("](", "").replace(")", "")
-                        full_response += content
-                        yield f"data: {json.dumps({'content': content})}\n\n"
+                        timer.token()
+                    if chunk.get("done"):
+                        timer.model_stats(chunk)
+                    batch = coalescer.feed(reply.add(sanitizer.feed(content)))
+                if batch:
+                    yield f"data: {json.dumps({'content': batch})}\n\n"
 
-                except json.JSONDecodeError:
-                    continue
+            batch = coalescer.feed(reply.add(sanitizer.close())) + coalescer.flush()
+            if batch:
+                yield f"data: {json.dumps({'content': batch})}\n\n"
+
+            full_response = reply.text()
+            if cache_id and cached is None and full_response:
+                response_cache.put(cache_id, full_response)
 
             if save_to_session and sid:
-                sessions_db[sid].append({"role": "assistant", "content": full_response})
-                write_to_log(sid, user_input, full_response)
+                finish_turn(sid, user_input, full_response)
+            timer.finish()
 
         except Exception as e:
+            timer.finish(error=e)
             yield f"data: {json.dumps({'error': str(e)})}\n\n"
-
-    return Response(generate(), mimetype="text/event-stream")
+        finally:
+            # Also runs when the client disconnects (GeneratorExit at a yield):
+            # closing the response aborts the upstream stream, so Ollama stops
+            # generating an answer nobody will read
+            if response is not None:
+                response.close()
+            if prepare is not None:
+                prepare.close()
+            if ticket is not None:
+                ticket.release()
+            timer.finish(cancelled=True)  # no-op unless the client went away
+
+    sse = Response(generate(), mimetype="text/event-stream")
+    if ticket is not None:
+        # Frees the slot even if the client left before the stream started
+        sse.call_on_close(ticket.release)
+    return sse
+
+
+def queue_events(ticket):
+    # Waits for a generation slot, sending the place in line every
+    # QUEUE_UPDATE_SECONDS; each event also reveals a client that left
+    if ticket.wait(0):
+        return
+    while True:
+        yield f"data: {json.dumps({'queue': {'position': ticket.position()}})}\n\n"
+        if ticket.wait(QUEUE_UPDATE_SECONDS):
+            return
+
+
+def progress_events(prepare):
+    # Forward progress as SSE events; the generator's return value passes through
+    while True:
+        try:
+            progress = next(prepare)
+        except StopIteration as done:
+            return done.value
+        yield f"data: {json.dumps({'progress': progress})}\n\n"
 
 # =====================================================
 # COMMAND HANDLER
 # =====================================================
 
-def handle_log_command(user_input: str, sid: str):
-    parts = user_input.strip().split(maxsplit=1)
+LOG_ANALYSIS_PROMPT = (
+    "Analyze this application log. "
+    "Summarize key events, detect errors, and highlight patterns."
+)
+
+
+def prepare_full_analysis(path, sid):
+    # Map: summarize entry-aligned chunks in parallel. Reduce: the returned messages
+    # ask the model to combine the partial summaries (streamed like a normal reply).
+    # Each map/combine call waits for its own scheduler slot
+    cancelled = threading.Event()
+    summarize = scheduled(log_summarizer, sid, cancelled=cancelled)
+    try:
+        with LogChunks(path, MAX_LOG_CHARS) as chunks:
+            combined = yield from map_reduce(chunks, summarize, workers=LOG_MAP_WORKERS, budget_chars=MAX_LOG_CHARS)
+    finally:
+        cancelled.set()  # calls still queued give up if the client went away
+    return get_context(sid).build(extra=[
+        {"role": "system", "content": REDUCE_PROMPT},
+        {"role": "user", "content": combined},
+    ])
+
+
+def build_log_request(user_input: str, sid: str):
+    """Return ``(system_reply, None, None, None)`` or ``(None, messages, cache_id, prepare)``.
+
+    With ``--full``, ``messages`` is None and ``prepare`` is a generator that
+    reports map-reduce progress and then returns the messages to stream.
+    """
+    parts = user_input.strip().split()
+    no_cache = "--no-cache" in parts
+    full = "--full" in parts
+    parts = [p for p in parts if p not in ("--no-cache", "--full")]
+    log_writer.flush()  # include turns still waiting in the write queue
 
     # /log → list files
     if len(parts) == 1:
-        logs = sorted(f.name for f in LOG_DIR.glob("*.txt"))
+        logs = log_directory.listing()
         if not logs:
-            return jsonify({"type": "system", "content": "No log files found."})
-        return jsonify({
-            "type": "system",
-            "content": "Available logs:\n" + "\n".join(logs),
-        })
+            return "No log files found.", None, None, None
+        return "Available logs:\n" + logs, None, None, None
 
-    # /log filename.txt
-    filename = parts[1]
-    log_content, error = read_log_file(filename)
+    # /log filename.txt [--from N] [--lines M] [--full]
+    try:
+        filename, start, count = parse_log_args(parts[1:])
+    except ValueError:
+        return "Usage: /log <file> [--from N] [--lines M] [--full]", None, None, None
+
+    if full:
+        path, error = resolve_log_path(filename)
+        if error:
+            return f"Error: {error}", None, None, None
+        # Hashing a huge file per request would cost more than the lookup saves:
+        # key the whole-file analysis on its identity instead.
+        st = path.stat()
+        cache_id = None if no_cache else cache_key(MODEL, REDUCE_PROMPT, f"{path}:{st.st_size}:{st.st_mtime_ns}")
+        return None, None, cache_id, prepare_full_analysis(path, sid)
+
+    log_content, error = read_log_file(filename, start, count)
 
     if error:
-        return jsonify({"type": "system", "content": f"Error: {error}"})
-
-    log_content = log_content[-MAX_LOG_CHARS:]
-
-    temp_messages = [
-        *sessions_db[sid],
-        {
-            "role": "system",
-            "content": (
-                "Analyze this application log. "
-                "Summarize key events, detect errors, and highlight patterns."
-            ),
-        },
+        return f"Error: {error}", None, None, None
+
+    temp_messages = get_context(sid).build(extra=[
+        {"role": "system", "content": LOG_ANALYSIS_PROMPT},
         {"role": "user", "content": log_content},
-    ]
+    ])
+    cache_id = None if no_cache else cache_key(MODEL, LOG_ANALYSIS_PROMPT, log_content)
+
+    return None, temp_messages, cache_id, None
 
-    return stream_model(temp_messages, timeout=60)
+
+def handle_log_command(user_input: str, sid: str):
+    started = time.perf_counter()
+    reply, temp_messages, cache_id, prepare = build_log_request(user_input, sid)
+
+    if reply is not None:
+        metrics.record_request("log", "system", started)
+        return jsonify({"type": "system", "content": reply})
+
+    cached = response_cache.get(cache_id) if cache_id else None
+    ticket = None
+    if cached is None:
+        ticket = admit(sid, PRIORITY_LOG, "log", started)
+        if ticket is None:
+            return busy_reply()
+    return stream_model(temp_messages, timeout=60, cached=cached, cache_id=cache_id, prepare=prepare,
+                        endpoint="log", started=started, ticket=ticket)
 
 # =====================================================
 # ROUTES
@@ -191,8 +556,21 @@ def home():
     return render_template("index.html")
 
 
+@app.route("/metrics")
+def metrics_endpoint():
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
+
+@app.route("/health")
+def health():
+    # 200 once the model is in memory, 503 while cold/loading or if Ollama is down
+    status = ollama.model_status()
+    return jsonify(status), 200 if status["loaded"] else 503
+
+
 @app.route("/chat", methods=["POST"])
 def chat():
+    started = time.perf_counter()
     sid = session.get("sid")
     user_input = request.json.get("message", "").strip()
 
@@ -204,14 +582,24 @@ def chat():
         return handle_log_command(user_input, sid)
 
     # -------- Normal Chat --------
-    sessions_db[sid].append({"role": "user", "content": user_input})
+    ticket = admit(sid, PRIORITY_CHAT, "chat", started)
+    if ticket is None:
+        return busy_reply()
+    try:
+        sessions.append(sid, {"role": "user", "content": user_input})
+        messages = get_context(sid).build()
+    except BaseException:
+        ticket.release()
+        raise
 
     return stream_model(
-        sessions_db[sid],
+        messages,
         timeout=30,
         save_to_session=True,
         sid=sid,
         user_input=user_input,
+        started=started,
+        ticket=ticket,
     )
 
 # =====================================================
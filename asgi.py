@@ -0,0 +1,421 @@
+# ur own privaty AI, made by GitHub: https://github.com/PinkMath
+# Async (ASGI) serving mode: same "/" and "/chat" (incl. /log) behavior as app.py,
+# but upstream Ollama streams are non-blocking, so one process can hold hundreds
+# of concurrent SSE streams without a thread per client.
+#
+#   pip install starlette uvicorn httpx jinja2 itsdangerous
+#   python asgi.py --host 0.0.0.0 --port 5000
+import os
+import json
+import time
+import uuid
+import argparse
+import asyncio
+import weakref
+import contextlib
+from pathlib import Path
+
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+from starlette.templating import Jinja2Templates
+
+from app import (
+    BUSY_MESSAGE,
+    BUSY_RETRY_AFTER,
+    CONNECT_TIMEOUT,
+    HTTP_POOL_SIZE,
+    KEEP_ALIVE,
+    LOG_DIR,
+    MODEL,
+    NUM_CTX,
+    QUEUE_UPDATE_SECONDS,
+    SESSION_BACKEND,
+    SSE_FLUSH_BYTES,
+    SSE_FLUSH_MS,
+    admit,
+    build_log_request,
+    finish_turn,
+    get_context,
+    init_session,
+    ollama,
+    replay_lines,
+    response_cache,
+    scheduler,
+    sessions,
+)
+from terminalAI.ai_core import metrics
+from terminalAI.ai_core.ollama_client import RETRY_STATUSES
+from terminalAI.ai_core.scheduler import PRIORITY_CHAT, PRIORITY_LOG
+from terminalAI.ai_core.stream_pipeline import Accumulator, Coalescer, Sanitizer, chunk_content, decode_line
+
+# =====================================================
+# APP CONFIG
+# =====================================================
+
+SECRET_KEY = "ferret_secret_key_99"
+MAX_CONNECTIONS = 512
+
+BASE_DIR = Path(__file__).resolve().parent
+templates = Jinja2Templates(directory=BASE_DIR / "templates")
+upstream = None
+
+# =====================================================
+# UPSTREAM CLIENT
+# =====================================================
+
+@contextlib.asynccontextmanager
+async def lifespan(_app):
+    global upstream
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=HTTP_POOL_SIZE)
+    async with httpx.AsyncClient(limits=limits) as client:
+        upstream = client
+        yield
+    upstream = None
+
+# =====================================================
+# SESSION MANAGEMENT
+# =====================================================
+
+async def ensure_session(request) -> str:
+    if "sid" not in request.session:
+        request.session["sid"] = str(uuid.uuid4())
+
+    # The SQLite backend does blocking I/O: keep it off the event loop
+    await asyncio.to_thread(init_session, request.session["sid"])
+    return request.session["sid"]
+
+# =====================================================
+# MODEL STREAMING (REUSABLE)
+# =====================================================
+
+async def upstream_lines(messages, timeout, sid=None):
+    # Routed by the app's BackendPool; a backend that fails before its first
+    # line (the first token) is taken out of rotation and the next one is tried
+    tried, error = [], None
+    while True:
+        backend = ollama.acquire(sid, tried)
+        if backend is None:
+            raise error
+        tried.append(backend)
+        started = False
+        try:
+            async with upstream.stream(
+                "POST",
+                backend.url,
+                json={
+                    "model": MODEL,
+                    "messages": messages,
+                    "stream": True,
+                    "options": {"num_ctx": NUM_CTX},
+                    "keep_alive": KEEP_ALIVE,
+                },
+                timeout=httpx.Timeout(timeout, connect=CONNECT_TIMEOUT),
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    started = True
+                    yield line
+            return
+        except httpx.HTTPError as e:
+            if started or (isinstance(e, httpx.HTTPStatusError) and e.response.status_code not in RETRY_STATUSES):
+                raise
+            ollama.mark_failed(backend, e)
+            error = e
+        finally:
+            ollama.release(backend)
+
+
+def next_progress(prepare):
+    # Runs in a worker thread: the map phase blocks on model calls
+    try:
+        return next(prepare), None
+    except StopIteration as done:
+        return None, done.value
+
+
+async def timed_lines(lines, coalescer):
+    # Yields upstream lines, or None when batched text is due but the model is
+    # still quiet, so a pause never holds back tokens we already have.
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(lines))
+            done, _ = await asyncio.wait({pending}, timeout=coalescer.due_in())
+            if not done:
+                yield None
+                continue
+            task, pending = pending, None
+            try:
+                line = task.result()
+            except StopAsyncIteration:
+                return
+            yield line
+    finally:
+        if pending is not None:
+            pending.cancel()  # interrupts the read; upstream_lines' ``async with`` closes the stream
+        else:
+            asyncio.ensure_future(lines.aclose())
+
+
+def admit_async(sid, priority, endpoint, started):
+    # The scheduler is thread-based; wake this event loop when the slot is granted
+    loop = asyncio.get_running_loop()
+    granted = asyncio.Event()
+    ticket = admit(sid, priority, endpoint, started, notify=lambda: loop.call_soon_threadsafe(granted.set))
+    return ticket, granted
+
+
+def busy_reply():
+    return JSONResponse({"error": BUSY_MESSAGE}, status_code=503, headers={"Retry-After": str(BUSY_RETRY_AFTER)})
+
+
+async def cached_lines(text):
+    for line in replay_lines(text):
+        yield line.decode("utf-8")
+
+
+def stream_model(messages, timeout=30, save_to_session=False, sid=None, user_input=None,
+                 cached=None, cache_id=None, prepare=None, endpoint="chat", started=None,
+                 ticket=None, granted=None, disconnected=None):
+    """``ticket``/``granted``: scheduler slot from ``admit_async``, released when the stream ends.
+    ``disconnected``: ``request.is_disconnected``, polled so a closed tab stops the upstream stream.
+    """
+    started = started or time.perf_counter()
+
+    async def client_gone():
+        return disconnected is not None and await disconnected()
+
+    async def wait_for_slot(ticket, granted):
+        while not ticket.granted.is_set():
+            yield f"data: {json.dumps({'queue': {'position': ticket.position()}})}\n\n"
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(granted.wait(), QUEUE_UPDATE_SECONDS)
+            if await client_gone():
+                return
+
+    async def generate():
+        nonlocal messages, ticket, granted
+        reply = Accumulator()
+        sanitizer = Sanitizer()
+        coalescer = Coalescer(SSE_FLUSH_MS / 1000, SSE_FLUSH_BYTES)
+        timer = metrics.RequestTimer(endpoint, cached=cached is not None, started=started)
+        timed = None
+
+        try:
+            if ticket is not None:
+                async for event in wait_for_slot(ticket, granted):
+                    yield event
+                if not ticket.granted.is_set():
+                    return
+                metrics.QUEUE_WAIT.observe(ticket.waited, endpoint=endpoint)
+
+            if prepare is not None and cached is None:
+                # The map phase takes slots per model call: don't hold one meanwhile
+                if ticket is not None:
+                    ticket.release()
+                while True:
+                    progress, result = await asyncio.to_thread(next_progress, prepare)
+                    if progress is None:
+                        messages = result
+                        break
+                    yield f"data: {json.dumps({'progress': progress})}\n\n"
+                    if await client_gone():
+                        return
+                if ticket is not None:
+                    loop = asyncio.get_running_loop()
+                    granted = asyncio.Event()
+                    ticket = scheduler.submit(ticket.sid, ticket.priority,
+                                              lambda: loop.call_soon_threadsafe(granted.set))
+                    async for event in wait_for_slot(ticket, granted):
+                        yield event
+                    if not ticket.granted.is_set():
+                        return
+
+            lines = cached_lines(cached) if cached is not None else upstream_lines(messages, timeout, sid)
+            timed = timed_lines(lines, coalescer)
+
+            async for line in timed:
+                if line is None:
+                    batch = coalescer.flush()
+                else:
+                    chunk = decode_line(line)
+                    if chunk is None:
+                        continue
+                    content = chunk_content(chunk)
+                    if content:
+                        timer.token()
+                    if chunk.get("done"):
+                        timer.model_stats(chunk)
+                    batch = coalescer.feed(reply.add(sanitizer.feed(content)))
+                if batch:
+                    yield f"data: {json.dumps({'content': batch})}\n\n"
+                    if await client_gone():
+                        return
+
+            batch = coalescer.feed(reply.add(sanitizer.close())) + coalescer.flush()
+            if batch:
+                yield f"data: {json.dumps({'content': batch})}\n\n"
+
+            full_response = reply.text()
+            if cache_id and cached is None and full_response:
+                await asyncio.to_thread(response_cache.put, cache_id, full_response)
+
+            if save_to_session and sid:
+                # Session/log bookkeeping is blocking I/O: keep it off the event loop
+                await asyncio.to_thread(finish_turn, sid, user_input, full_response)
+            timer.finish()
+
+        except Exception as e:
+            timer.finish(error=e)
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+        finally:
+            # Cleanup runs in its own task: this one may be cancelled (client gone),
+            # and closing the line generators aborts the upstream stream
+            if timed is not None:
+                asyncio.ensure_future(timed.aclose())
+            if prepare is not None:
+                with contextlib.suppress(ValueError):  # still running in a worker thread
+                    prepare.close()
+            if ticket is not None:
+                ticket.release()
+            timer.finish(cancelled=True)  # no-op unless the client went away
+
+    stream = generate()
+    if ticket is not None:
+        # Frees the slot even if the client left before the stream started
+        weakref.finalize(stream, ticket.release)
+    return StreamingResponse(stream, media_type="text/event-stream")
+
+# =====================================================
+# COMMAND HANDLER
+# =====================================================
+
+async def handle_log_command(user_input: str, sid: str, request):
+    started = time.perf_counter()
+    reply, temp_messages, cache_id, prepare = await asyncio.to_thread(build_log_request, user_input, sid)
+
+    if reply is not None:
+        metrics.record_request("log", "system", started)
+        return JSONResponse({"type": "system", "content": reply})
+
+    cached = await asyncio.to_thread(response_cache.get, cache_id) if cache_id else None
+    ticket = granted = None
+    if cached is None:
+        ticket, granted = admit_async(sid, PRIORITY_LOG, "log", started)
+        if ticket is None:
+            return busy_reply()
+    return stream_model(temp_messages, timeout=60, cached=cached, cache_id=cache_id, prepare=prepare,
+                        endpoint="log", started=started, ticket=ticket, granted=granted,
+                        disconnected=request.is_disconnected)
+
+# =====================================================
+# ROUTES
+# =====================================================
+
+async def home(request):
+    await ensure_session(request)
+    return templates.TemplateResponse(request, "index.html")
+
+
+async def metrics_endpoint(request):
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+async def health(request):
+    status = await asyncio.to_thread(ollama.model_status)
+    return JSONResponse(status, status_code=200 if status["loaded"] else 503)
+
+
+async def chat(request):
+    started = time.perf_counter()
+    sid = await ensure_session(request)
+    body = await request.json()
+    user_input = body.get("message", "").strip()
+
+    if not user_input:
+        return JSONResponse({"error": "Empty message"}, status_code=400)
+
+    # -------- /log command --------
+    if user_input.lower().startswith("/log"):
+        return await handle_log_command(user_input, sid, request)
+
+    # -------- Normal Chat --------
+    ticket, granted = admit_async(sid, PRIORITY_CHAT, "chat", started)
+    if ticket is None:
+        return busy_reply()
+    try:
+        await asyncio.to_thread(sessions.append, sid, {"role": "user", "content": user_input})
+        messages = await asyncio.to_thread(lambda: get_context(sid).build())
+    except BaseException:
+        ticket.release()
+        raise
+
+    return stream_model(
+        messages,
+        timeout=30,
+        save_to_session=True,
+        sid=sid,
+        user_input=user_input,
+        started=started,
+        ticket=ticket,
+        granted=granted,
+        disconnected=request.is_disconnected,
+    )
+
+
+app = Starlette(
+    routes=[
+        Route("/", home),
+        Route("/chat", chat, methods=["POST"]),
+        Route("/metrics", metrics_endpoint),
+        Route("/health", health),
+        Mount("/static", StaticFiles(directory=BASE_DIR / "static"), name="static"),
+    ],
+    middleware=[Middleware(SessionMiddleware, secret_key=SECRET_KEY)],
+    lifespan=lifespan,
+)
+
+# =====================================================
+# MAIN (production launcher)
+# =====================================================
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Ferret AI async web server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes; the limit of concurrent model streams is split between them")
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args()
+
+    if args.workers > 1 and SESSION_BACKEND != "sqlite":
+        parser.error("--workers > 1 needs FERRET_SESSION_BACKEND=sqlite so workers share sessions")
+    # Read by app.py in each worker process to split MAX_ACTIVE_GENERATIONS
+    os.environ["FERRET_WORKERS"] = str(args.workers)
+
+    print("\n" + "=" * 50)
+    print(" Ferret AI Web (async) is starting!")
+    print(f" Logs directory: {LOG_DIR}")
+    print("=" * 50 + "\n")
+
+    uvicorn.run(
+        "asgi:app" if args.workers > 1 else app,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=args.log_level,
+        proxy_headers=True,
+        app_dir=str(BASE_DIR),
+    )
+
+
+if __name__ == "__main__":
+    main()
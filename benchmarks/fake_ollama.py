@@ -0,0 +1,150 @@
+# ur own privaty AI, made by GitHub: https://github.com/PinkMath
+# Local stand-in for Ollama's /api/chat and /api/embed. Chat replays a scripted
+# NDJSON stream at a fixed token rate, so benchmarks measure Ferret's own
+# overhead, not the model; embeddings are hashed bags of words.
+#
+#   python benchmarks/fake_ollama.py --port 11434 --tokens 400 --rate 200 --chunk 1
+import json
+import time
+import zlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EMBED_DIM = 64
+CODE_SAMPLE = "\n```python\ndef handler(event):\n    return {\"status\": 200, \"body\": event}\n```\n"
+
+
+def scripted_reply(tokens):
+    # Prose tokens with a code block in the middle, like a typical coding answer
+    words = [f"token{i} " for i in range(tokens)]
+    words.insert(len(words) // 2, CODE_SAMPLE)
+    return words
+
+
+def fake_embedding(text):
+    # Hashed bag of words: deterministic, and texts sharing words score close
+    vector = [0.0] * EMBED_DIM
+    for word in text.lower().split():
+        vector[zlib.crc32(word.encode("utf-8")) % EMBED_DIM] += 1.0
+    return vector
+
+
+class FakeOllama:
+    def __init__(self, host="127.0.0.1", port=0, tokens=400, rate=200.0, chunk=1, summary_delay=0.05):
+        self.tokens = tokens
+        self.rate = rate
+        self.chunk = chunk
+        self.summary_delay = summary_delay
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api/chat"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, payload):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _write_chunk(self, data):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            def do_GET(self):
+                self._send_json({"models": [{"name": "deepseek-coder:6.7b"}]})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with fake._lock:
+                    fake.requests += 1
+
+                if self.path == "/api/embed":
+                    inputs = body.get("input", [])
+                    inputs = [inputs] if isinstance(inputs, str) else inputs
+                    self._send_json({"model": body.get("model"), "embeddings": [fake_embedding(t) for t in inputs]})
+                    return
+
+                if not body.get("stream", True):
+                    # Summaries (context compaction, /log --full map steps)
+                    time.sleep(fake.summary_delay)
+                    self._send_json({"message": {"role": "assistant", "content": "Summary: nothing unusual."}, "done": True})
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                words = scripted_reply(fake.tokens)
+                delay = fake.chunk / fake.rate if fake.rate else 0
+                started = time.perf_counter()
+                for i in range(0, len(words), fake.chunk):
+                    content = "".join(words[i:i + fake.chunk])
+                    line = {"model": body.get("model"), "message": {"role": "assistant", "content": content}, "done": False}
+                    self._write_chunk(json.dumps(line).encode("utf-8") + b"\n")
+                    if delay:
+                        # Sleep to the schedule, not per chunk, so the rate holds under load
+                        ahead = started + (i // fake.chunk + 1) * delay - time.perf_counter()
+                        if ahead > 0:
+                            time.sleep(ahead)
+                done = {
+                    "model": body.get("model"),
+                    "message": {"role": "assistant", "content": ""},
+                    "done": True,
+                    "eval_count": fake.tokens,
+                    "eval_duration": int((time.perf_counter() - started) * 1e9),
+                }
+                self._write_chunk(json.dumps(done).encode("utf-8") + b"\n")
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama /api/chat and /api/embed for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--tokens", type=int, default=400, help="tokens per streamed reply")
+    parser.add_argument("--rate", type=float, default=200.0, help="tokens per second (0 = unthrottled)")
+    parser.add_argument("--chunk", type=int, default=1, help="tokens per NDJSON line")
+    args = parser.parse_args()
+
+    fake = FakeOllama(args.host, args.port, args.tokens, args.rate, args.chunk)
+    print(f"Fake Ollama listening on {fake.url}")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
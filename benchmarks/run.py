@@ -0,0 +1,423 @@
+# ur own privaty AI, made by GitHub: https://github.com/PinkMath
+# Benchmarks Ferret's own overhead against a local fake Ollama (no model needed).
+#
+#   python benchmarks/run.py                       # everything, results saved as JSON
+#   python benchmarks/run.py --only web --clients 32
+#   python benchmarks/run.py --compare benchmarks/results/bench_20260101_120000.json
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import contextlib
+import builtins
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from fake_ollama import FakeOllama
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+sys.path.insert(0, str(ROOT / "terminalAI"))
+
+QUERIES = [
+    "where is the session handler defined",
+    "how does parse_config validate the port",
+    "Traceback KeyError in load_user",
+    "render template with cache",
+]
+
+# =====================================================
+# PROCESS STATS
+# =====================================================
+
+def process_stats(pid):
+    """``(cpu_seconds, rss_bytes)`` for a process (psutil, else /proc on Linux)."""
+    try:
+        import psutil
+
+        proc = psutil.Process(pid)
+        cpu = proc.cpu_times()
+        return cpu.user + cpu.system, proc.memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+        with open(f"/proc/{pid}/status") as f:
+            rss = next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmRSS:"))
+        return cpu, rss
+    except (OSError, StopIteration, ValueError):
+        return None, None
+
+
+def self_peak_rss():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def summarize(values):
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    return {
+        "median": round(statistics.median(values), 6),
+        "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 6),
+        "min": round(values[0], 6),
+        "max": round(values[-1], 6),
+    }
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+# =====================================================
+# WEB (app.py /chat and /log)
+# =====================================================
+
+def start_web_server(fake, log_dir, port):
+    env = dict(os.environ, FERRET_OLLAMA_URL=fake.url, FERRET_LOG_DIR=str(log_dir), FERRET_WARMUP="0")
+    code = f"import app; app.app.run(host='127.0.0.1', port={port}, threaded=True)"
+    proc = subprocess.Popen(
+        [sys.executable, "-c", code], cwd=ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            requests.get(base + "/", timeout=1)
+            return proc, base
+        except requests.RequestException:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("app.py did not start")
+
+
+def sse_request(base, message, session=None):
+    session = session or requests.Session()
+    started = time.perf_counter()
+    first_byte = first_content = first_progress = None
+    events = chars = 0
+    buffer = b""
+    with session.post(base + "/chat", json={"message": message}, stream=True, timeout=300) as r:
+        for data in r.iter_content(chunk_size=None):
+            now = time.perf_counter()
+            if first_byte is None:
+                first_byte = now
+            buffer += data
+            *complete, buffer = buffer.split(b"\n\n")
+            for event in complete:
+                if not event.startswith(b"data: "):
+                    continue
+                payload = json.loads(event[6:])
+                events += 1
+                if "progress" in payload and first_progress is None:
+                    first_progress = now
+                if payload.get("content"):
+                    chars += len(payload["content"])
+                    if first_content is None:
+                        first_content = now
+    ended = time.perf_counter()
+    return {
+        "ttfb": (first_byte or ended) - started,
+        "ttft": (first_content or ended) - started,
+        "first_progress": first_progress and first_progress - started,
+        "total": ended - started,
+        "stream": ended - (first_content or ended),
+        "events": events,
+        "chars": chars,
+    }
+
+
+def write_synthetic_log(path, size_mb):
+    entry = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while f.tell() < size_mb * 1024 * 1024:
+            ts = f"{entry // 3600 % 24:02d}:{entry // 60 % 60:02d}:{entry % 60:02d}"
+            f.write(f"[{ts}] USER: request {entry} failed with code {entry % 7}?\n")
+            f.write(f"[{ts}] AI: Retried request {entry}; status {'ERROR' if entry % 13 == 0 else 'ok'}\n")
+            f.write("-" * 40 + "\n")
+            entry += 1
+
+
+def bench_web(fake, args, workdir):
+    log_dir = workdir / "web_logs"
+    proc, base = start_web_server(fake, log_dir, free_port())
+    try:
+        cpu_before, _ = process_stats(proc.pid)
+        results = []
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            jobs = [pool.submit(sse_request, base, "hello") for _ in range(args.clients * args.rounds)]
+            results = [job.result() for job in jobs]
+        wall = time.perf_counter() - started
+        cpu_after, rss = process_stats(proc.pid)
+
+        tokens = args.tokens * len(results)
+        chat = {
+            "clients": args.clients,
+            "requests": len(results),
+            "wall_s": round(wall, 4),
+            "ttfb_s": summarize(r["ttfb"] for r in results),
+            "ttft_s": summarize(r["ttft"] for r in results),
+            "tokens_per_s_per_client": summarize(args.tokens / r["stream"] for r in results if r["stream"] > 0),
+            "tokens_per_s_total": round(tokens / wall, 2),
+            "events_per_reply": summarize(r["events"] for r in results),
+            "server_cpu_us_per_token": (
+                round((cpu_after - cpu_before) / tokens * 1e6, 3) if cpu_before is not None else None
+            ),
+            "server_rss_mb": rss and round(rss / 2**20, 2),
+        }
+
+        write_synthetic_log(log_dir / "bench.txt", args.log_mb)
+        tail = sse_request(base, "/log bench.txt --no-cache")
+        calls_before = fake.requests
+        full = sse_request(base, "/log bench.txt --full --no-cache")
+        _, rss = process_stats(proc.pid)
+        log = {
+            "log_mb": args.log_mb,
+            "tail_ttft_s": round(tail["ttft"], 4),
+            "tail_total_s": round(tail["total"], 4),
+            "full_first_progress_s": full["first_progress"] and round(full["first_progress"], 4),
+            "full_ttft_s": round(full["ttft"], 4),
+            "full_total_s": round(full["total"], 4),
+            "full_model_calls": fake.requests - calls_before,
+            "server_rss_mb": rss and round(rss / 2**20, 2),
+        }
+        return {"chat": chat, "log": log}
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+# =====================================================
+# TERMINAL (FerretAI streaming and /project)
+# =====================================================
+
+class Sink(io.StringIO):
+    """stdout stand-in: records when the first text arrives and how many writes."""
+
+    def __init__(self, tty):
+        super().__init__()
+        self.tty = tty
+        self.writes = 0
+        self.first_write = None
+
+    def isatty(self):
+        return self.tty
+
+    def write(self, text):
+        if self.first_write is None and text.strip():
+            self.first_write = time.perf_counter()
+        self.writes += 1
+        return super().write(text)
+
+
+def make_ferret(fake, workdir):
+    from ai_core.config import CONFIG
+
+    CONFIG["url"] = fake.url
+    CONFIG["log_dir"] = str(workdir / "term_logs")
+    CONFIG["index_cache_dir"] = str(workdir / "index_cache")
+    CONFIG["response_cache_dir"] = str(workdir / "response_cache")
+    CONFIG["warmup"] = False  # the fake server has nothing to load
+
+    from ai_core.engine import FerretAI
+
+    original_input = builtins.input
+    builtins.input = lambda prompt="": "1"
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return FerretAI()
+    finally:
+        builtins.input = original_input
+
+
+def bench_terminal(fake, args, ferret):
+    from ai_core.config import CONFIG
+
+    messages = [{"role": "system", "content": "bench"}, {"role": "user", "content": "hello"}]
+    results = {}
+    for mode, tty in (("tty", True), ("pipe", False)):
+        runs = []
+        for _ in range(args.rounds):
+            sink = Sink(tty)
+            with contextlib.redirect_stdout(sink):
+                cpu, started = time.process_time(), time.perf_counter()
+                response = ferret.client.chat(messages, options={"num_ctx": CONFIG["num_ctx"]})
+                ferret._render_stream(response.iter_lines())
+                ended = time.perf_counter()
+            runs.append({
+                "ttft": (sink.first_write or ended) - started,
+                "total": ended - started,
+                "cpu": time.process_time() - cpu,
+                "writes": sink.writes,
+            })
+        results[mode] = {
+            "ttft_s": summarize(r["ttft"] for r in runs),
+            "tokens_per_s": summarize(args.tokens / r["total"] for r in runs),
+            "cpu_us_per_token": summarize(r["cpu"] / args.tokens * 1e6 for r in runs),
+            "writes_per_reply": summarize(r["writes"] for r in runs),
+        }
+    return results
+
+
+def write_synthetic_project(root, files):
+    for i in range(files):
+        package = root / f"pkg{i % 10}"
+        package.mkdir(parents=True, exist_ok=True)
+        if i % 4 == 3:
+            (package / f"widget{i}.js").write_text(
+                f"import {{ api }} from './api';\n\nexport function renderWidget{i}(props) {{\n"
+                f"  const cache = new Map();\n  return api.render('widget{i}', props, cache);\n}}\n\n"
+                f"class Store{i} {{\n  constructor() {{ this.items = []; }}\n  add(item) {{ this.items.push(item); }}\n}}\n",
+                encoding="utf-8",
+            )
+            continue
+        body = "\n".join(
+            f"def handler_{i}_{j}(event, session):\n"
+            f"    \"\"\"Handle event {j} for module {i}.\"\"\"\n"
+            f"    config = parse_config(event.get('config', {{}}))\n"
+            f"    if config['port'] < 0:\n        raise ValueError('bad port')\n"
+            f"    return load_user(session, event['user_{j}'])\n"
+            for j in range(8)
+        )
+        (package / f"module{i}.py").write_text(
+            f"import os\nimport json\nfrom .common import parse_config, load_user\n\n\n"
+            f"class Service{i}:\n    def __init__(self):\n        self.sessions = {{}}\n\n"
+            f"    def session_handler(self, sid):\n        return self.sessions.get(sid)\n\n\n{body}",
+            encoding="utf-8",
+        )
+
+
+def bench_project(args, ferret, workdir):
+    project = workdir / "project"
+    write_synthetic_project(project, args.files)
+
+    timings = {}
+    for label in ("cold", "warm"):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            ferret._index_project(str(project))
+            timings[label] = time.perf_counter() - started
+
+    search_times = []
+    for _ in range(args.rounds):
+        for query in QUERIES:
+            started = time.perf_counter()
+            ferret.retriever.search(query)
+            search_times.append(time.perf_counter() - started)
+
+    return {
+        "files": len(ferret.project_index),
+        "blocks": len(ferret.project_blocks),
+        "index_cold_files_per_s": round(len(ferret.project_index) / timings["cold"], 1),
+        "index_warm_files_per_s": round(len(ferret.project_index) / timings["warm"], 1),
+        "search_ms": summarize(t * 1000 for t in search_times),
+    }
+
+# =====================================================
+# RESULTS
+# =====================================================
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def flatten(data, prefix=""):
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from flatten(value, name + ".")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, value
+
+
+def compare(previous, current):
+    old = dict(flatten(previous.get("results", {})))
+    print(f"\n{'metric':<60} {'before':>12} {'after':>12} {'change':>8}")
+    for name, value in flatten(current["results"]):
+        if name not in old:
+            continue
+        before = old[name]
+        change = f"{(value - before) / before * 100:+.1f}%" if before else "n/a"
+        print(f"{name:<60} {before:>12.4g} {value:>12.4g} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ferret AI benchmark suite")
+    parser.add_argument("--only", choices=("web", "terminal", "project"), action="append",
+                        help="run only these parts (repeatable)")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent SSE clients")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--tokens", type=int, default=400, help="tokens per fake reply")
+    parser.add_argument("--rate", type=float, default=200.0, help="fake model tokens/s (0 = unthrottled)")
+    parser.add_argument("--chunk", type=int, default=1, help="tokens per NDJSON line")
+    parser.add_argument("--files", type=int, default=400, help="files in the synthetic project")
+    parser.add_argument("--log-mb", type=float, default=8.0, help="size of the synthetic /log file")
+    parser.add_argument("--output", help="where to save the JSON (default: benchmarks/results/)")
+    parser.add_argument("--compare", help="previous results JSON to diff against")
+    args = parser.parse_args()
+    parts = args.only or ["web", "terminal", "project"]
+
+    fake = FakeOllama(tokens=args.tokens, rate=args.rate, chunk=args.chunk).start()
+    workdir = Path(tempfile.mkdtemp(prefix="ferret_bench_"))
+    results = {}
+    try:
+        if "web" in parts:
+            print("Benchmarking app.py /chat and /log ...")
+            results["web"] = bench_web(fake, args, workdir)
+        if "terminal" in parts or "project" in parts:
+            ferret = make_ferret(fake, workdir)
+            if "terminal" in parts:
+                print("Benchmarking terminal streaming ...")
+                results["terminal"] = bench_terminal(fake, args, ferret)
+            if "project" in parts:
+                print("Benchmarking /project indexing and retrieval ...")
+                results["project"] = bench_project(args, ferret, workdir)
+                results["project"]["bench_peak_rss_mb"] = self_peak_rss() and round(self_peak_rss() / 2**20, 2)
+    finally:
+        fake.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        "results": results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(json.dumps(results, indent=2))
+    print(f"\nSaved to {output}")
+
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text(encoding="utf-8")), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ import platform
 import os
 
 MODEL = "deepseek-coder:6.7b"
+OLLAMA_URL = "http://localhost:11434/api/chat"
+KEEP_ALIVE = "30m"
 
 # --- Color codes ---
 RED = "\033[31m"
@@ -92,6 +94,18 @@ def ensure_model_downloaded(model):
         run_cmd(["ollama", "pull", model], check=True)
         print(f"{GREEN}Model '{model}' downloaded{RESET}")
 
+def warm_up_model(model):
+    # An empty chat only loads the model, so the first real question skips the cold start
+    print(f"{YELLOW}Loading '{model}' into memory...{RESET}")
+    try:
+        import requests
+        response = requests.post(OLLAMA_URL, json={"model": model, "messages": [], "keep_alive": KEEP_ALIVE}, timeout=600)
+        response.raise_for_status()
+        print(f"{GREEN}Model '{model}' loaded (kept in memory for {KEEP_ALIVE} after each request){RESET}")
+    except Exception as e:
+        print(f"{YELLOW}Could not preload the model ({e}). It will load on the first request.{RESET}")
+    print(f"{CYAN}Tip: set OLLAMA_KEEP_ALIVE (e.g. 8h) on the Ollama server to keep it loaded longer.{RESET}")
+
 # --- Main Installer ---
 if __name__ == "__main__":
     clear_terminal_full()  # Clean terminal at start
@@ -109,5 +123,8 @@ if __name__ == "__main__":
     # Ensure the model is downloaded
     ensure_model_downloaded(MODEL)
 
+    # Load it now so the first chat doesn't wait for it
+    warm_up_model(MODEL)
+
     print(f"\n{GREEN}✅ Setup completed successfully!{RESET}")
     print(f"{CYAN}You can now run your AI application using 'python -m ferret' or your main script.{RESET}")
@@ -70,32 +70,54 @@ async function sendMessage() {
       body: JSON.stringify({ message: text })
     });
 
+    // System replies (e.g. /log listing) come back as plain JSON, not SSE
+    if ((response.headers.get("Content-Type") || "").includes("application/json")) {
+      const data = await response.json();
+      removeTypingIndicator(dotsIndicator);
+      aiMsgDiv.textContent = data.content || data.error || "";
+      scrollIfNearBottom(messagesContainer);
+      return;
+    }
+
     const reader = response.body.getReader();
     const decoder = new TextDecoder();
-    let fullText = "";
+    const parts = [];
+    const stream = createStreamWriter(aiMsgDiv);
+    let buffer = "";
 
     while (true) {
       const { done, value } = await reader.read();
       if (done) break;
-      const chunk = decoder.decode(value);
-      const lines = chunk.split("\n");
-
-      for (const line of lines) {
-        if (!line.startsWith("data: ")) continue;
-        try {
-          const data = JSON.parse(line.slice(6));
-          if (data.content) {
-            fullText += data.content;
-            aiMsgDiv.textContent = fullText + " ";
-            scrollIfNearBottom(messagesContainer);
-          }
-        } catch(e){ console.error("Stream parse error:", e);}
+      // stream: true keeps multi-byte characters split across reads intact
+      buffer += decoder.decode(value, { stream: true });
+      // An SSE event can also be split across reads: keep the unfinished tail
+      const events = buffer.split("\n\n");
+      buffer = events.pop();
+
+      for (const event of events) {
+        for (const line of event.split("\n")) {
+          if (!line.startsWith("data: ")) continue;
+          try {
+            const data = JSON.parse(line.slice(6));
+            if (data.queue && !parts.length) {
+              aiMsgDiv.textContent = queueText(data.queue);
+            }
+            if (data.progress && !parts.length) {
+              aiMsgDiv.textContent = progressText(data.progress);
+            }
+            if (data.content) {
+              parts.push(data.content);
+              stream.append(data.content);
+            }
+          } catch(e){ console.error("Stream parse error:", e);}
+        }
       }
     }
 
+    stream.cancel();
     removeTypingIndicator(dotsIndicator);
     aiMsgDiv.textContent = "";
-    renderFormattedMessage(aiMsgDiv, fullText);
+    renderFormattedMessage(aiMsgDiv, parts.join(""));
     scrollIfNearBottom(messagesContainer);
 
   } catch (err) {
@@ -127,6 +149,47 @@ function scrollIfNearBottom(container, threshold=32){
     container.scrollTop = container.scrollHeight;
 }
 
+// ======= STREAMED TEXT (one DOM update per animation frame) =======
+function createStreamWriter(div) {
+  const node = document.createTextNode("");
+  let pending = "";
+  let frame = 0;
+
+  function flush() {
+    frame = 0;
+    if (node.parentNode !== div) {
+      div.textContent = "";
+      div.appendChild(node);
+    }
+    node.appendData(pending);
+    pending = "";
+    scrollIfNearBottom(messagesContainer);
+  }
+
+  return {
+    append(text) {
+      pending += text;
+      if (!frame) frame = requestAnimationFrame(flush);
+    },
+    cancel() {
+      if (frame) cancelAnimationFrame(frame);
+      frame = 0;
+      pending = "";
+    },
+  };
+}
+
+// ======= WAITING FOR A MODEL SLOT =======
+function queueText({ position }) {
+  return position > 1 ? `Waiting in line: ${position - 1} ahead of you...` : "Up next...";
+}
+
+// ======= /log --full PROGRESS =======
+function progressText({ stage, done, total }) {
+  const label = stage === "map" ? "Reading log" : "Merging summaries";
+  return `${label}: ${done}/${total} parts...`;
+}
+
 // ======= TYPING DOTS =======
 function createTypingIndicator(){
   const container = document.createElement("span");
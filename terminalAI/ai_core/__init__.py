@@ -1,22 +1,43 @@
-import os
-from datetime import datetime
+import threading
 from .config import CONFIG
 from .utils import _print_banner
+from .retrieval import BM25Index, FileEntries
+from .context import ContextWindow
+from .ollama_client import get_client, start_warmup
+from .response_cache import ResponseCache
+from .log_writer import LogWriter
 
 class FerretAIInit:
-    def __init__(self):
+    def __init__(self, persona=None, interactive=True):
         # Project / context
         self.project_index = {}
-        self.project_chunks = []
-        self.project_blocks = []
+        self.project_chunks = FileEntries()
+        self.project_blocks = FileEntries()
         self.symbol_index = {}
+        self.retriever = BM25Index()
+        self.semantic = None
         self.project_root = None
+        self.project_lock = threading.Lock()  # the watcher thread updates the index
+        self.project_generation = 0  # bumped on every project reset
+        self.watcher = None
 
         # Chat context
+        self.client = get_client()
+        self.response_cache = ResponseCache()
         self.messages = []
+        self.context = ContextWindow(self.messages)
         self.code_blocks = []
 
-        self._select_persona()
-        self.log_file = os.path.join(CONFIG["log_dir"], f"chat_TERM_{datetime.now().strftime('%Y%m%d')}.txt")
-        self._setup_env()
+        # Loads the model while the persona prompt and banner are on screen
+        if interactive and CONFIG["warmup"]:
+            start_warmup(self.client, CONFIG["keep_warm_hours"])
+
+        if persona is None:
+            self._select_persona()
+        else:
+            self._set_persona(persona)
+        self.log_writer = LogWriter(CONFIG["log_dir"], "chat_TERM", separator="-" * 30)
+        self.log_file = self.log_writer.current_path()
+        if interactive:
+            self._setup_env()
 # ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
@@ -0,0 +1,213 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import os
+import csv
+import glob
+import json
+import time
+import queue
+import threading
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+from .config import CONFIG, PERSONAS
+from .oneshot import FILE_PROMPTS, MAX_FILE_CHARS, file_prompt
+from .ollama_client import get_client
+from .response_cache import ResponseCache, cache_key
+from .stream_pipeline import chunk_content, iter_chunks
+
+
+# --- BATCH INPUT ---
+def load_items(source=None, pattern=None, mode="normal"):
+    """Batch items from a JSONL/CSV file or a file glob.
+
+    Each item is a dict with an ``id`` and a ``prompt`` and/or a ``file``
+    (analysed with ``mode``, like /file). JSONL lines may also be plain strings.
+    """
+    items = []
+    if pattern:
+        for path in sorted(glob.glob(pattern, recursive=True)):
+            if os.path.isfile(path):
+                items.append({"id": path, "file": path, "mode": mode})
+
+    if source:
+        with open(source, "r", encoding="utf-8", newline="") as f:
+            if source.lower().endswith(".csv"):
+                rows = list(csv.DictReader(f))
+            else:
+                rows = [json.loads(line) for line in f if line.strip()]
+        for n, row in enumerate(rows, start=1):
+            if isinstance(row, str):
+                row = {"prompt": row}
+            if not row.get("prompt") and not row.get("file"):
+                raise ValueError(f"{source}: item {n} has no prompt or file")
+            item = {"id": str(row.get("id") or n)}
+            if row.get("prompt"):
+                item["prompt"] = row["prompt"]
+            if row.get("file"):
+                item["file"] = row["file"]
+                item["mode"] = row.get("mode") or mode
+            items.append(item)
+
+    for index, item in enumerate(items):
+        item["index"] = index
+    return items
+
+
+def item_prompt(item):
+    """(user_input, cache_id) for one item; file analyses share the /file cache."""
+    parts, cache_id = [], None
+    if item.get("file"):
+        with open(item["file"], "r", encoding="utf-8") as f:
+            content = f.read(MAX_FILE_CHARS)
+        parts.append(file_prompt(os.path.basename(item["file"]), content, item["mode"]))
+    if item.get("prompt"):
+        parts.append(item["prompt"] if not parts else f"Question: {item['prompt']}")
+
+    user_input = "\n\n".join(parts)
+    if item.get("file") and item["mode"] in FILE_PROMPTS and len(parts) == 1:
+        cache_id = cache_key(CONFIG["model"], item["mode"], user_input)
+    return user_input, cache_id
+
+
+# --- RESUME ---
+def completed_ids(path):
+    """Ids already answered in an earlier run's output (failed items run again)."""
+    done = set()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # line cut short by an interrupted run
+                if isinstance(record, dict) and record.get("status") == "ok":
+                    done.add(str(record.get("id")))
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def open_results(path):
+    # Append, starting on a fresh line if the last run died mid-record
+    f = open(path, "a+", encoding="utf-8")
+    if f.tell():
+        f.seek(f.tell() - 1)
+        if f.read(1) != "\n":
+            f.write("\n")
+    return f
+
+
+# --- WORKERS ---
+def model_stats(data):
+    # Ollama reports durations in nanoseconds
+    stats = {}
+    for key in ("prompt_eval_count", "eval_count"):
+        if data.get(key) is not None:
+            stats[key] = data[key]
+    for key in ("load_duration", "prompt_eval_duration", "eval_duration", "total_duration"):
+        if data.get(key):
+            stats[key.replace("duration", "s")] = round(data[key] / 1e9, 4)
+    if data.get("eval_count") and data.get("eval_duration"):
+        stats["eval_tokens_per_s"] = round(data["eval_count"] / (data["eval_duration"] / 1e9), 2)
+    return stats
+
+
+class Interrupted(Exception):
+    pass
+
+
+def stream_reply(response, stop):
+    """(text, final chunk) of a streamed reply; gives up between lines once ``stop`` is set."""
+    parts, data = [], {}
+    try:
+        for chunk in iter_chunks(response.iter_lines()):
+            if stop.is_set():
+                raise Interrupted("batch interrupted")
+            parts.append(chunk_content(chunk))
+            data = chunk
+    finally:
+        response.close()
+    return "".join(parts), data
+
+
+def run_item(client, cache, system_prompt, item, read_timeout=None, stop=None):
+    """Answer one item; never raises, failures are recorded in the result."""
+    record = {"id": item["id"], "index": item["index"]}
+    if item.get("file"):
+        record.update(file=item["file"], mode=item["mode"])
+    started = time.perf_counter()
+    try:
+        user_input, cache_id = item_prompt(item)
+        cached = cache.get(cache_id) if cache_id else None
+        if cached is not None:
+            record.update(status="ok", cached=True, response=cached)
+        else:
+            messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_input}]
+            response = client.chat(messages, options={"num_ctx": CONFIG["num_ctx"]}, read_timeout=read_timeout)
+            text, data = stream_reply(response, stop or threading.Event())
+            if cache_id and text:
+                cache.put(cache_id, text)
+            record.update(status="ok", cached=False, **model_stats(data), response=text)
+    except Exception as e:
+        record.update(status="error", error=str(e))
+    record["duration_s"] = round(time.perf_counter() - started, 4)
+    return record
+
+
+def _worker(jobs, stop):
+    while not stop.is_set():
+        job = jobs.get()
+        if job is None:
+            return
+        future, args = job
+        if future.set_running_or_notify_cancel():
+            future.set_result(run_item(*args, stop=stop))
+
+
+def run_batch(items, workers=None, ordered=False, persona=None, read_timeout=None):
+    """Yield one result dict per item, with at most ``workers`` requests in flight.
+
+    Results come as they complete, or in input order with ``ordered``. Only a
+    small window of items is queued at a time, so an interrupted run stops
+    quickly and the output never lags far behind the work done.
+    """
+    workers = max(1, workers or CONFIG["batch_workers"])
+    window = workers * 4
+    client = get_client(pool_size=max(workers, CONFIG["http_pool_size"]))
+    cache = ResponseCache()
+    system_prompt = PERSONAS[persona or next(iter(PERSONAS))]
+
+    todo = iter(enumerate(items))
+    pending, ready, next_position = {}, {}, 0
+    # Daemon workers and a stop flag: Ctrl-C must not wait out requests already
+    # sent (up to the read timeout) before the interpreter can exit
+    jobs, stop = queue.Queue(), threading.Event()
+    for n in range(workers):
+        threading.Thread(target=_worker, args=(jobs, stop), name=f"batch-{n}", daemon=True).start()
+    try:
+        while True:
+            while len(pending) + len(ready) < window:
+                position, item = next(todo, (None, None))
+                if item is None:
+                    break
+                future = Future()
+                jobs.put((future, (client, cache, system_prompt, item, read_timeout)))
+                pending[future] = position
+            if not pending:
+                break
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                position = pending.pop(future)
+                if ordered:
+                    ready[position] = future.result()
+                else:
+                    yield future.result()
+            while next_position in ready:
+                yield ready.pop(next_position)
+                next_position += 1
+    finally:
+        stop.set()
+        for future in pending:
+            future.cancel()
+        for _ in range(workers):
+            jobs.put(None)
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
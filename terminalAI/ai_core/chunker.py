@@ -0,0 +1,291 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import re
+import ast
+from bisect import bisect_right
+
+# Blocks are (qualified_name, text, start_line, end_line), lines 1-based inclusive.
+# Code outside any declaration keeps the historical "file_scope" name.
+FILE_SCOPE = "file_scope"
+MAX_BLOCK_CHARS = 4000
+
+JS_EXT = (".js", ".jsx", ".ts", ".tsx")
+C_EXT = (".c", ".h", ".cpp", ".hpp", ".cc", ".cxx")
+LUA_EXT = (".lua",)
+
+# --- DECLARATION PATTERNS ---
+# (regex, kind): "class" scans its body for members, "namespace" scans its body
+# with the top-level patterns, "block" is emitted whole.
+JS_PATTERNS = [
+    (re.compile(r"^\s*(?:export\s+(?:default\s+)?)?(?:declare\s+)?(?:abstract\s+)?class\s+([A-Za-z_$][\w$]*)"), "class"),
+    (re.compile(r"^\s*(?:export\s+)?(?:declare\s+)?(?:namespace|module)\s+([A-Za-z_$][\w$.]*)\s*\{"), "namespace"),
+    (re.compile(r"^\s*(?:export\s+(?:default\s+)?)?(?:declare\s+)?(?:async\s+)?function\s*\*?\s*([A-Za-z_$][\w$]*)"), "block"),
+    (re.compile(r"^\s*(?:export\s+)?(?:declare\s+)?(?:const\s+)?(?:interface|enum|type)\s+([A-Za-z_$][\w$]*)"), "block"),
+    (re.compile(r"^\s*(?:export\s+)?(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*(?::[^=]+)?=\s*(?:async\s+)?"
+                r"(?:function\b|\([^)]*\)\s*(?::[^=]+)?=>|[A-Za-z_$][\w$]*\s*=>)"), "block"),
+]
+JS_MEMBER_PATTERNS = [
+    (re.compile(r"^\s*(?:(?:public|private|protected|static|async|get|set|readonly|override|abstract)\s+)*\*?"
+                r"(?!(?:if|for|while|switch|catch|return|function|else|do|new|await)\b)"
+                r"(#?[A-Za-z_$][\w$]*)\s*(?:<[^>(]*>)?\s*\("), "block"),
+]
+C_PATTERNS = [
+    (re.compile(r"^\s*(?:template\s*<.*>\s*)?(?:typedef\s+)?(?:class|struct|union)\s+(?:\w+\s+)*?([A-Za-z_]\w*)"
+                r"\s*(?:final\s*)?(?::[^;{]*)?\{?\s*$"), "class"),
+    (re.compile(r"^\s*namespace\s+([A-Za-z_][\w:]*)\s*\{?\s*$"), "namespace"),
+    (re.compile(r"^\s*enum(?:\s+class)?\s+([A-Za-z_]\w*)[^;]*$"), "block"),
+    (re.compile(r"^(?!\s*(?:if|for|while|switch|return|else|do|case|sizeof|typedef)\b)\s*"
+                r"(?:[A-Za-z_][\w:<>,\*&\s]*?[\s\*&])?"
+                r"(~?[A-Za-z_]\w*(?:::~?[A-Za-z_]\w*)*|operator\s*[^\s(]+)\s*\([^;]*$"), "block"),
+]
+LUA_PATTERNS = [
+    (re.compile(r"^\s*(?:local\s+)?function\s+([\w.:]+)\s*\("), "block"),
+    (re.compile(r"^\s*(?:local\s+)?([\w.:]+)\s*=\s*function\s*\("), "block"),
+]
+
+BRACE_TOKEN_RE = re.compile(
+    r"//[^\n]*|/\*.*?\*/|\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`|[{}();]",
+    re.DOTALL,
+)
+LUA_TOKEN_RE = re.compile(
+    r"--\[(=*)\[.*?\]\1\]|--[^\n]*|\[(=*)\[.*?\]\2\]|\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'"
+    r"|\b(function|if|do|repeat|end|until)\b",
+    re.DOTALL,
+)
+COMMENT_PREFIXES = ("//", "/*", "*", "--", "@")
+
+
+# --- BLOCK END DETECTION ---
+def _find_brace_end(content, start):
+    # Offset of the brace closing the first body opened after `start`, or None
+    # when a statement ends (";") before any body starts.
+    parens, depth = 0, 0
+    for m in BRACE_TOKEN_RE.finditer(content, start):
+        tok = m.group()
+        if depth == 0:
+            if tok == "(":
+                parens += 1
+            elif tok == ")":
+                parens = max(parens - 1, 0)
+            elif tok == ";" and parens == 0:
+                return None
+            elif tok == "{" and parens == 0:
+                depth = 1
+        elif tok == "{":
+            depth += 1
+        elif tok == "}":
+            depth -= 1
+            if depth == 0:
+                return m.start()
+    return None
+
+
+def _find_lua_end(content, start):
+    depth = 0
+    for m in LUA_TOKEN_RE.finditer(content, start):
+        keyword = m.group(3)
+        if not keyword:
+            continue
+        if keyword in ("function", "if", "do", "repeat"):
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return m.start()
+    return None
+
+
+# --- GENERIC HELPERS ---
+def _join(lines, start, end, skip=()):
+    # 0-based inclusive range, leaving out nested member ranges
+    skipped = {i for a, b in skip for i in range(a, b + 1)}
+    return "\n".join(lines[i] for i in range(start, end + 1) if i not in skipped)
+
+
+def _gap_blocks(lines, consumed, lo, hi):
+    blocks, run = [], []
+    taken = set()
+    for a, b in consumed:
+        taken.update(range(a, b + 1))
+    for i in range(lo, hi):
+        if i in taken:
+            if run:
+                blocks.append(run)
+                run = []
+        else:
+            run.append(i)
+    if run:
+        blocks.append(run)
+    return [
+        (FILE_SCOPE, "\n".join(lines[i] for i in run), run[0] + 1, run[-1] + 1)
+        for run in blocks
+        if any(lines[i].strip() for i in run)
+    ]
+
+
+def _split_large(blocks, max_chars=MAX_BLOCK_CHARS):
+    result = []
+    for name, text, start, end in blocks:
+        if len(text) <= max_chars:
+            result.append((name, text, start, end))
+            continue
+        piece, piece_start, size = [], start, 0
+        for offset, line in enumerate(text.split("\n")):
+            if piece and size + len(line) > max_chars:
+                result.append((name, "\n".join(piece), piece_start, piece_start + len(piece) - 1))
+                piece, piece_start, size = [], start + offset, 0
+            piece.append(line)
+            size += len(line) + 1
+        if piece:
+            result.append((name, "\n".join(piece), piece_start, piece_start + len(piece) - 1))
+    return result
+
+
+# --- PYTHON (ast) ---
+def _python_scope(body, lines, prefix, blocks):
+    consumed = []
+    for node in body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        start = min([d.lineno for d in node.decorator_list] + [node.lineno]) - 1
+        end = node.end_lineno - 1
+        qual = prefix + node.name
+        if isinstance(node, ast.ClassDef):
+            slot = len(blocks)
+            blocks.append(None)
+            members = _python_scope(node.body, lines, qual + ".", blocks)
+            blocks[slot] = (qual, _join(lines, start, end, members), start + 1, end + 1)
+        else:
+            blocks.append((qual, _join(lines, start, end), start + 1, end + 1))
+        consumed.append((start, end))
+    return consumed
+
+
+def chunk_python(content):
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return chunk_plain(content)
+    lines = content.split("\n")
+    blocks = []
+    consumed = _python_scope(tree.body, lines, "", blocks)
+    blocks.extend(_gap_blocks(lines, consumed, 0, len(lines)))
+    blocks.sort(key=lambda b: b[2])
+    return _split_large(blocks)
+
+
+# --- BRACE / KEYWORD LANGUAGES ---
+def _match_decl(line, patterns):
+    for regex, kind in patterns:
+        m = regex.match(line)
+        if m:
+            return m, kind
+    return None, None
+
+
+def _declaration_scope(content, lines, line_starts, lo, hi, spec, patterns, prefix, top, blocks):
+    consumed = []
+    i = lo
+    while i < hi:
+        line = lines[i]
+        if top and line[:1].isspace():
+            i += 1
+            continue
+        m, kind = _match_decl(line, patterns)
+        if not m:
+            i += 1
+            continue
+        end_offset = spec["end"](content, line_starts[i] + m.start())
+        if end_offset is None:
+            i += 1
+            continue
+        j = min(bisect_right(line_starts, end_offset) - 1, hi - 1)
+
+        # Pull directly preceding comments/annotations into the block
+        start = i
+        floor = consumed[-1][1] + 1 if consumed else lo
+        while start > floor and lines[start - 1].strip().startswith(COMMENT_PREFIXES):
+            start -= 1
+
+        qual = prefix + re.sub(r"\s+", "", m.group(1))
+        if kind in ("class", "namespace") and j > i:
+            inner = spec["members"] if kind == "class" else patterns
+            slot = len(blocks)
+            blocks.append(None)
+            members = _declaration_scope(content, lines, line_starts, i + 1, j, spec, inner, qual + ".", False, blocks)
+            blocks[slot] = (qual, _join(lines, start, j, members), start + 1, j + 1)
+        else:
+            blocks.append((qual, _join(lines, start, j), start + 1, j + 1))
+        consumed.append((start, j))
+        i = j + 1
+    return consumed
+
+
+def _chunk_declarations(content, spec):
+    lines = content.split("\n")
+    line_starts, offset = [], 0
+    for line in lines:
+        line_starts.append(offset)
+        offset += len(line) + 1
+    blocks = []
+    consumed = _declaration_scope(content, lines, line_starts, 0, len(lines), spec, spec["patterns"], "", True, blocks)
+    blocks.extend(_gap_blocks(lines, consumed, 0, len(lines)))
+    blocks.sort(key=lambda b: b[2])
+    return _split_large(blocks)
+
+
+LANG_SPECS = {
+    "js": {"patterns": JS_PATTERNS, "members": JS_MEMBER_PATTERNS, "end": _find_brace_end},
+    "c": {"patterns": C_PATTERNS, "members": C_PATTERNS, "end": _find_brace_end},
+    "lua": {"patterns": LUA_PATTERNS, "members": LUA_PATTERNS, "end": _find_lua_end},
+}
+
+
+# --- PLAIN TEXT / MARKDOWN ---
+def chunk_plain(content, max_chars=2000):
+    lines = content.split("\n")
+    blocks, run, size = [], [], 0
+    for i, line in enumerate(lines):
+        # Prefer breaking on blank lines once the chunk is reasonably full
+        if run and (size + len(line) > max_chars or (not line.strip() and size > max_chars // 2)):
+            blocks.append(run)
+            run, size = [], 0
+        run.append(i)
+        size += len(line) + 1
+    if run:
+        blocks.append(run)
+    return _split_large([
+        (FILE_SCOPE, "\n".join(lines[i] for i in run), run[0] + 1, run[-1] + 1)
+        for run in blocks
+        if any(lines[i].strip() for i in run)
+    ])
+
+
+def chunk_markdown(content):
+    lines = content.split("\n")
+    blocks, name, start, in_fence = [], FILE_SCOPE, 0, False
+    for i, line in enumerate(lines):
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        elif line.startswith("#") and not in_fence:
+            if i > start and "\n".join(lines[start:i]).strip():
+                blocks.append((name, "\n".join(lines[start:i]), start + 1, i))
+            name, start = line.lstrip("#").strip() or FILE_SCOPE, i
+    if "\n".join(lines[start:]).strip():
+        blocks.append((name, "\n".join(lines[start:]), start + 1, len(lines)))
+    return _split_large(blocks)
+
+
+# --- DISPATCH ---
+def chunk_file(file, content):
+    if file.endswith(".py"):
+        return chunk_python(content)
+    if file.endswith(JS_EXT):
+        return _chunk_declarations(content, LANG_SPECS["js"])
+    if file.endswith(C_EXT):
+        return _chunk_declarations(content, LANG_SPECS["c"])
+    if file.endswith(LUA_EXT):
+        return _chunk_declarations(content, LANG_SPECS["lua"])
+    if file.endswith(".md"):
+        return chunk_markdown(content)
+    return chunk_plain(content)
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
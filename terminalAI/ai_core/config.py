@@ -16,12 +16,48 @@ else:
 
 CONFIG = {
     "url": "http://localhost:11434/api/chat",
+    # Several Ollama servers, e.g. ["http://gpu1:11434/api/chat", "http://gpu2:11434/api/chat"];
+    # requests go to the least busy healthy one (empty: just "url")
+    "backends": [],
+    "backend_probe_interval": 10,
+    "backend_max_skew": 2,
     "model": "deepseek-coder:6.7b",
     "log_dir": LOG_DIR,
     "persona": "",  
-    "max_context_messages": 100,
+    "num_ctx": 8192,
+    "context_reserve_tokens": 1024,
+    "http_pool_size": 4,
+    "connect_timeout": 3.05,
+    "read_timeout": 120,
+    "http_retries": 3,
+    "http_backoff": 0.5,
+    "keep_alive": "30m",  # how long Ollama keeps the model loaded after each request
+    "warmup": True,  # load the model in the background at startup
+    "keep_warm_hours": (8, 19),  # local hours to keep re-warming the model (None: never)
+    "keep_warm_interval": 600,
+    "response_cache_dir": LOG_DIR / "response_cache",
+    "response_cache_entries": 128,
+    "response_cache_bytes": 64 * 1024 * 1024,
+    "log_batch_size": 50,
+    "log_flush_interval": 1.0,
+    "log_max_bytes": 10 * 1024 * 1024,
+    "log_compress": True,
+    "log_retention_days": None,  # delete logs older than this many days (None: keep everything)
+    "render_fps": 30,
+    "typing_effect": False,  # cosmetic per-character output (slower than the model)
     "typing_speed": 0.005,
     "max_code_lines": 20,
+    "index_cache_dir": LOG_DIR / "index_cache",
+    "index_workers": os.cpu_count() or 4,
+    "semantic_search": False,  # /project ask by embeddings (needs numpy and the embed model pulled)
+    "semantic_fusion": True,  # merge the semantic and keyword rankings
+    "embed_model": "nomic-embed-text",
+    "embed_batch_size": 32,
+    "project_watch": False,  # keep a loaded project indexed as files change (/project watch)
+    "watch_debounce": 0.5,  # seconds of quiet after a save before re-indexing
+    "watch_poll_interval": 1.0,  # where inotify is unavailable: seconds between scans of the tree
+    "watch_poll_load": 0.05,  # at most this share of the time goes to scanning (big trees scan less often)
+    "batch_workers": 4,  # match OLLAMA_NUM_PARALLEL on the server
 }
 
 PERSONAS = {
@@ -0,0 +1,156 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import threading
+from .config import CONFIG
+from .ollama_client import get_client
+
+# Compact once the prompt passes this share of the budget, keeping roughly
+# this share of the most recent turns verbatim.
+COMPACT_AT = 0.75
+KEEP_RECENT = 0.4
+MESSAGE_OVERHEAD = 4
+TRANSCRIPT_CHARS_PER_MESSAGE = 2000
+
+SUMMARY_INSTRUCTIONS = (
+    "Summarize the conversation below for your own future reference. "
+    "Keep facts, decisions, file and symbol names, and open questions. "
+    "Be concise and do not add anything that was not said."
+)
+
+
+def estimate_tokens(text):
+    # ~4 chars per token is close enough for budgeting English and code
+    return len(text) // 4 + MESSAGE_OVERHEAD
+
+
+def ollama_summarizer(url=None, model=None, num_ctx=None, timeout=120, client=None):
+    # url None: get_client uses CONFIG["backends"] when set, else CONFIG["url"]
+    model = model or CONFIG["model"]
+    num_ctx = num_ctx or CONFIG["num_ctx"]
+
+    def summarize(previous, messages):
+        transcript = "\n".join(
+            f"{m['role'].upper()}: {m['content'][:TRANSCRIPT_CHARS_PER_MESSAGE]}" for m in messages
+        )
+        if previous:
+            transcript = f"EARLIER SUMMARY: {previous}\n{transcript}"
+        response = (client or get_client(url, model)).chat(
+            [
+                {"role": "system", "content": SUMMARY_INSTRUCTIONS},
+                {"role": "user", "content": transcript},
+            ],
+            stream=False,
+            options={"num_ctx": num_ctx},
+            read_timeout=timeout,
+        )
+        return response.json().get("message", {}).get("content", "").strip()
+
+    return summarize
+
+
+# --- TOKEN-BUDGETED CONTEXT WINDOW ---
+class ContextWindow:
+    """Token-budgeted view over a conversation list.
+
+    ``messages[0]`` is the pinned system/persona message. Older turns are
+    folded into a rolling summary by a background thread between turns;
+    ``build()`` returns what is actually sent to the model.
+    """
+
+    def __init__(self, messages, num_ctx=None, reserve=None, summarizer=None,
+                 summary="", summarized_upto=1, on_compact=None):
+        self.num_ctx = num_ctx or CONFIG["num_ctx"]
+        self.reserve = CONFIG["context_reserve_tokens"] if reserve is None else reserve
+        self.summarizer = summarizer or ollama_summarizer(num_ctx=self.num_ctx)
+        # Called with (summary, summarized_upto) so a session store can persist them
+        self.on_compact = on_compact
+        self._lock = threading.Lock()
+        self._worker = None
+        self.reset(messages)
+        self.summary, self.summarized_upto = summary, summarized_upto
+
+    @property
+    def budget(self):
+        return max(self.num_ctx - self.reserve, 256)
+
+    def reset(self, messages):
+        with self._lock:
+            self.messages = messages
+            self.summary = ""
+            self.summarized_upto = 1
+            self._generation = getattr(self, "_generation", 0) + 1
+
+    def _summary_message(self):
+        if not self.summary:
+            return None
+        return {"role": "system", "content": f"Summary of the earlier conversation:\n{self.summary}"}
+
+    def build(self, extra=()):
+        with self._lock:
+            pinned = self.messages[:1]
+            summary = self._summary_message()
+            if summary:
+                pinned = pinned + [summary]
+            recent = self.messages[max(self.summarized_upto, 1):] + list(extra)
+
+        used = sum(estimate_tokens(m["content"]) for m in pinned)
+        # Hard limit: drop the oldest turns the summary hasn't caught up with yet,
+        # but always keep the latest message.
+        kept, total = [], used
+        for message in reversed(recent):
+            cost = estimate_tokens(message["content"])
+            if kept and total + cost > self.budget:
+                break
+            kept.append(message)
+            total += cost
+        return pinned + kept[::-1]
+
+    def used_tokens(self):
+        return sum(estimate_tokens(m["content"]) for m in self.build())
+
+    def compact_async(self):
+        if self._worker and self._worker.is_alive():
+            return
+        job = self._plan_compaction()
+        if job is None:
+            return
+        self._worker = threading.Thread(target=self._compact, args=job, daemon=True)
+        self._worker.start()
+
+    def compact(self):
+        """Summarize older turns now, on the calling thread, if over budget."""
+        job = self._plan_compaction()
+        if job is not None:
+            self._compact(*job)
+
+    def _plan_compaction(self):
+        if self.used_tokens() <= self.budget * COMPACT_AT:
+            return None
+
+        with self._lock:
+            start = max(self.summarized_upto, 1)
+            keep, cut = 0, len(self.messages)
+            while cut > start and keep + estimate_tokens(self.messages[cut - 1]["content"]) <= self.budget * KEEP_RECENT:
+                cut -= 1
+                keep += estimate_tokens(self.messages[cut]["content"])
+            if cut <= start:
+                # A single huge turn: summarize everything but the last message
+                cut = max(len(self.messages) - 1, start)
+            if cut <= start:
+                return None
+            batch = self.messages[start:cut]
+            return self.summary, batch, cut, self._generation
+
+    def _compact(self, previous, batch, cut, generation):
+        try:
+            summary = self.summarizer(previous, batch)
+        except Exception:
+            # Keep the old summary; build() still enforces the budget
+            return
+        with self._lock:
+            if generation != self._generation or not summary:
+                return
+            self.summary = summary
+            self.summarized_upto = cut
+        if self.on_compact:
+            self.on_compact(summary, cut)
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
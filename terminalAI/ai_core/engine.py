@@ -1,37 +1,30 @@
 import os
 import sys
-import json
 import time
 import random
 import requests
 import threading
-import textwrap
-from datetime import datetime
 from pathlib import Path
+from itertools import islice
 
 # Internal imports from our package
 from .config import CONFIG, PERSONAS, C, possible_paths
-from .utils import _print_banner, _typing_indicator, _get_terminal_width
+from .utils import _print_banner, _typing_indicator, _print_progress
+from .index_cache import ProjectIndexCache
+from .ingest import ingest_files
+from .response_cache import cache_key, replay_lines
+from .retrieval import BM25Index, FileEntries
+from .semantic import SemanticIndex, VectorCache, embed_missing, fuse, numpy_available
+from .watcher import ProjectWatcher, WHOLE_TREE
+from .renderer import ResponseRenderer
+from .stream_pipeline import Accumulator, iter_chunks, iter_content
+from .oneshot import FILE_PROMPTS, MAX_FILE_CHARS, file_prompt
 from . import FerretAIInit
 
-# Clipboard support
-try:
-    import pyperclip
-    CLIPBOARD_ENABLED = True
-except ImportError:
-    CLIPBOARD_ENABLED = False
+PROJECT_EXTENSIONS = (".py", ".js", ".jsx", ".ts", ".html", ".css", ".json", ".lua", ".c", ".cpp", ".md")
 
 # --- FERRET AI CLASS ---
 class FerretAI(FerretAIInit):
-    # --- TEXT CHUNKING ---
-    def _chunk_text(self, text, size=1200, overlap=200):
-        chunks, start = [], 0
-        while start < len(text):
-            end = start + size
-            chunks.append(text[start:end])
-            start += size - overlap
-        return chunks
-
     # --- PERSONA SELECTION ---
     def _select_persona(self):
         print("\nSelect AI persona or number:")
@@ -50,11 +43,14 @@ class FerretAI(FerretAIInit):
             print("Invalid input, defaulting to first persona")
             selected_persona = persona_keys[0]
 
+        self._set_persona(selected_persona)
+        print(f"{C['ai']}Persona set: {selected_persona}{C['reset']}\n")
+
+    def _set_persona(self, name):
         # Save the description in CONFIG, but return the name
-        CONFIG["persona"] = PERSONAS[selected_persona]
+        CONFIG["persona"] = PERSONAS[name]
         self.messages.append({"role": "system", "content": CONFIG["persona"]})
-
-        print(f"{C['ai']}Persona set: {selected_persona}{C['reset']}\n")
+        return name
 
     # --- HELP MENU ---
     def _show_help(self):
@@ -73,12 +69,14 @@ class FerretAI(FerretAIInit):
   /f | /file --summary <path>    Get concise summary
   /f | /file --explain <path>    Detailed explanation
   /f | /file --refactor <path>   Improve and return full code
+  /f | /file --no-cache ...      Ignore cached analysis of an unchanged file
 
 {C['info']}Project Commands:{C['reset']}
   /p | /project add <folder>     Index project directory
   /p | /project list             Show indexed files
   /p | /project remove           Unload project
   /p | /project ask <question>   Ask question about project
+  /p | /project watch            Re-index changed files live (on/off)
 
 {C['yellow']}Examples:{C['reset']}
   /file main.py | /f main.py
@@ -115,7 +113,7 @@ class FerretAI(FerretAIInit):
         print(f"● {C['context']}Model:{C['reset']} {CONFIG['model']}")
         print(f"● {C['info']}Commands:{C['reset']} /clear {C['info']}|{C['reset']} /exit {C['info']}|{C['reset']} /code {C['info']}|{C['reset']} /copy <num> {C['info']}|{C['reset']} /help {C['info']}|{C['reset']} /resetlog")
         print(f"● {C['info']}File:{C['reset']} /file <path> {C['info']}|{C['reset']} --summary {C['info']}|{C['reset']} --explain {C['info']}|{C['reset']} --refactor")
-        print(f"● {C['info']}Project:{C['reset']} /project add <dir> {C['info']}|{C['reset']} remove {C['info']}|{C['reset']} list {C['info']}|{C['reset']} ask <question>")
+        print(f"● {C['info']}Project:{C['reset']} /project add <dir> {C['info']}|{C['reset']} remove {C['info']}|{C['reset']} list {C['info']}|{C['reset']} ask <question> {C['info']}|{C['reset']} watch")
         print(f"● {C['context']}Logs:{C['reset']} saving to {CONFIG['log_dir']}")
         print(f"● {C['yellow']}Tip:{C['reset']} Use '/clear' to reset context without clearing logs")
         print(f"{C['cyan']}────────────────────────────────────────────────────────────────────{C['reset']}\n")
@@ -132,80 +130,30 @@ class FerretAI(FerretAIInit):
 
     # --- LOGGING ---
     def log_interaction(self, user_text, ai_text):
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            f.write(f"[{timestamp}] USER: {user_text}\n[{timestamp}] AI: {ai_text}\n{'-'*30}\n")
+        # Queued for the background writer; never blocks the chat loop
+        self.log_writer.write(user_text, ai_text)
 
     # --- CONTEXT BAR ---
-    def _context_bar(self, ctx_size):
-        ratio = min(ctx_size / CONFIG["max_context_messages"], 1.0)
+    def _context_bar(self):
+        used, budget = self.context.used_tokens(), self.context.budget
+        ratio = min(used / budget, 1.0)
         bar_length = 12
         filled = int(bar_length * ratio)
         empty = bar_length - filled
         bar = "█" * filled + "░" * empty
         color = C['context'] if ratio <= 0.4 else C['info'] if ratio <= 0.75 else C['error']
-        return f"{color}[{bar}] {int(ratio*100)}%{C['reset']}"
-
-    # --- CODE BLOCK RENDERING ---
-    def _render_code_block(self, code_text, show_gutter=True):
-        lines = code_text.strip().split("\n")
-        if lines and lines[0].startswith("```"):
-            lines = lines[1:]
-        if lines and lines[-1].startswith("```"):
-            lines = lines[:-1]
-
-        term_width = _get_terminal_width()
-        gutter = f"{C['code']}│{C['reset']}"
-        max_line_width = term_width - len(gutter) - 5
-        wrapped_lines = []
-
-        for line in lines:
-            wrapped_lines.extend(textwrap.wrap(line, width=max_line_width) or [""])
-
-        if show_gutter:
-            for idx, line in enumerate(wrapped_lines, start=1):
-                number_str = str(idx).rjust(3)
-                print(f"{gutter} {number_str} {C['light_yellow']}{line.ljust(max_line_width)}{C['reset']}")
-        return "\n".join(wrapped_lines)
-
-    # --- PYTHON SYMBOL EXTRACTION ---
-    def _extract_python_blocks(self, content):
-        blocks = []
-        lines = content.splitlines()
-        current_block, current_name = [], None
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith("def ") or stripped.startswith("class "):
-                if current_block:
-                    blocks.append((current_name, "\n".join(current_block)))
-                    current_block = []
-                current_name = stripped.split("(")[0].replace("def ", "").replace("class ", "").strip()
-                current_block.append(line)
-            elif current_block:
-                current_block.append(line)
-        if current_block:
-            blocks.append((current_name, "\n".join(current_block)))
-        return blocks
-
-    def _extract_imports(self, content):
-        imports = []
-        for line in content.splitlines():
-            if line.strip().startswith(("import ", "from ")):
-                imports.append(line.strip())
-        return imports
-
-    def _score_block(self, question, block_text, block_name=None):
-        score = 0
-        q_words = question.lower().split()
-        text = block_text.lower()
-        for word in q_words:
-            score += text.count(word) * 2
-            if block_name and word in block_name.lower():
-                score += 5
-        if "traceback" in question.lower():
-            score += text.count("raise") * 3
-        return score
-
+        return f"{color}[{bar}] {int(ratio*100)}% ({used}/{budget} tokens){C['reset']}"
+
+    # --- STREAMED REPLY ---
+    def _render_stream(self, stream_lines):
+        reply = Accumulator()
+        with ResponseRenderer() as renderer:
+            for content in iter_content(iter_chunks(stream_lines)):
+                renderer.feed(reply.add(content))
+        self.code_blocks.extend(renderer.code_blocks)
+        return reply.text()
+
+    # --- ONE-SHOT (scripts, pipes, git hooks) ---
     def _detect_traceback_target(self, question):
         if "Traceback" not in question:
             return None
@@ -219,6 +167,238 @@ class FerretAI(FerretAIInit):
                     pass
         return None
 
+    # --- PROJECT INDEXING ---
+    def _reset_project(self, root=None):
+        self._stop_watch()
+        with self.project_lock:
+            self.project_generation += 1  # the watcher drops updates begun before this
+            self.project_root = root
+            self.project_index = {}
+            self.project_chunks = FileEntries()
+            self.project_blocks = FileEntries()
+            self.symbol_index = {}
+            self.retriever = BM25Index()
+            self.semantic = None
+            self.project_cache = None
+            self.vector_cache = None
+
+    def _register_project_file(self, rel, entry):
+        self.project_index[rel] = entry
+        blocks = [(rel, block, name, (start, end)) for name, block, start, end in entry["blocks"]]
+        self.project_blocks.set(rel, blocks)
+        self.project_chunks.set(rel, [(rel, chunk) for chunk in entry["chunks"]])
+        for _, block, name, lines in blocks:
+            self.retriever.add(rel, block, name, lines)
+            if name:
+                self.symbol_index.setdefault(name, []).append((rel, block))
+        if self.semantic is not None:
+            self.semantic.add(blocks, self.vector_cache)
+
+    def _unregister_project_file(self, rel):
+        entry = self.project_index.pop(rel, None)
+        if entry is None:
+            return
+        # Every structure is keyed by file: only this file's entries are touched
+        self.project_blocks.remove_path(rel)
+        self.project_chunks.remove_path(rel)
+        for name, _, _, _ in entry["blocks"]:
+            if name in self.symbol_index:
+                self.symbol_index[name] = [s for s in self.symbol_index[name] if s[0] != rel]
+                if not self.symbol_index[name]:
+                    del self.symbol_index[name]
+        self.retriever.remove_path(rel)
+        if self.semantic is not None:
+            self.semantic.remove_path(rel)
+
+    def _index_project(self, folder):
+        self._reset_project(folder)
+        print(f"{C['info']}Indexing project with symbol extraction...{C['reset']}")
+        started = time.time()
+        cache = ProjectIndexCache(folder)
+        cache.load()
+        self.project_cache = cache
+        order, entries, pending = [], {}, []
+        for root, _, files in os.walk(folder):
+            for file in files:
+                if not file.endswith(PROJECT_EXTENSIONS):
+                    continue
+                path = os.path.join(root, file)
+                rel = os.path.relpath(path, folder)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+
+                order.append(rel)
+                # Unchanged mtime/size: reuse the cached entry without reading the file
+                entry = cache.lookup(rel, st)
+                if entry is None:
+                    pending.append((rel, path, file, st))
+                else:
+                    entries[rel] = entry
+
+        parsed = 0
+        for done, (rel, entry, fresh) in enumerate(ingest_files(pending, cache), start=1):
+            if entry is not None:
+                entries[rel] = entry
+            parsed += fresh
+            if done == len(pending) or done % 25 == 0:
+                _print_progress(done, len(pending), started)
+        if pending:
+            print()
+
+        # Register in walk order so results don't depend on worker scheduling
+        for rel in order:
+            if rel in entries:
+                self._register_project_file(rel, entries[rel])
+
+        removed = cache.prune(entries)
+        try:
+            cache.save()
+        except OSError as e:
+            print(f"{C['yellow']}Could not save index cache: {e}{C['reset']}")
+
+        elapsed = max(time.time() - started, 1e-6)
+        print(f"{C['green']}Indexed {len(self.project_index)} files, {len(self.project_blocks)} code blocks "
+              f"in {elapsed:.2f}s ({len(self.project_index) / elapsed:.0f} files/s).{C['reset']}")
+        print(f"{C['info']}Cache: {len(entries) - parsed} reused, {parsed} parsed, {len(removed)} removed.{C['reset']}")
+        if CONFIG["semantic_search"]:
+            self._embed_project(folder)
+        if CONFIG["project_watch"]:
+            self._start_watch()
+
+    def _embed_project(self, folder):
+        if not numpy_available():
+            print(f"{C['yellow']}numpy not installed: /project ask uses keyword search.{C['reset']}")
+            return
+        started = time.time()
+        cache = VectorCache(folder)
+        cache.load()
+        self.vector_cache = cache
+        progress = lambda done, total: _print_progress(done, total, started, "blocks")
+        try:
+            embedded = embed_missing(self.client, cache, self.project_blocks, progress=progress)
+            if embedded:
+                print()
+            self.semantic = SemanticIndex(self.project_blocks, cache)
+            cache.prune(set(self.semantic.hashes))
+        except (requests.RequestException, KeyError, ValueError) as e:
+            print(f"\n{C['yellow']}Could not embed project ({e}): /project ask uses keyword search.{C['reset']}")
+        finally:
+            # Batches that finished are kept even if a later one failed
+            try:
+                cache.save()
+            except OSError as e:
+                print(f"{C['yellow']}Could not save vector cache: {e}{C['reset']}")
+        if self.semantic is not None:
+            print(f"{C['info']}Embeddings: {len(self.semantic) - embedded} reused, {embedded} embedded.{C['reset']}")
+
+    # --- LIVE PROJECT UPDATES ---
+    def _start_watch(self):
+        wanted = lambda rel: rel.endswith(PROJECT_EXTENSIONS)
+        self.watcher = ProjectWatcher(self.project_root, self._update_project_files, wanted).start()
+        print(f"{C['info']}Watching {self.project_root} for changes ({self.watcher.kind}).{C['reset']}")
+
+    def _stop_watch(self):
+        if self.watcher is None:
+            return
+        self.watcher.stop()  # waits for an update in progress, so the saves below see a settled cache
+        self.watcher = None
+        # Entries parsed while watching make the next /project add instant
+        for cache in (self.project_cache, self.vector_cache):
+            try:
+                if cache is not None:
+                    cache.save()
+            except OSError as e:
+                print(f"{C['yellow']}Could not save index cache: {e}{C['reset']}")
+
+    def _update_project_files(self, changed):
+        """Re-index only the ``changed`` files or folders (relative to project_root)."""
+        # /project remove or add can reset the project while this runs: work on
+        # what was loaded when it started and drop the result if that changed.
+        # project_index is only changed on this thread (a reset swaps in a new
+        # dict), so it is read without copying it
+        with self.project_lock:
+            generation = self.project_generation
+            root, cache, vectors = self.project_root, self.project_cache, self.vector_cache
+            indexed, semantic = self.project_index, self.semantic is not None
+        if root is None or cache is None:
+            return
+        pending, seen, gone = [], set(), set()
+        for rel in changed:
+            path = os.path.join(root, rel)
+            if os.path.isdir(path):
+                # New or moved-in folder, or "." after lost events: check every file in it
+                prefix = "" if rel == WHOLE_TREE else rel + os.sep
+                for dirpath, _, files in os.walk(path):
+                    for file in files:
+                        if file.endswith(PROJECT_EXTENSIONS):
+                            seen.add(os.path.relpath(os.path.join(dirpath, file), root))
+                gone.update(r for r in indexed if r.startswith(prefix) and r not in seen)
+            elif os.path.isfile(path) and rel.endswith(PROJECT_EXTENSIONS):
+                seen.add(rel)
+            elif rel in indexed:
+                gone.add(rel)
+            else:
+                # A folder that went away: drop everything under it
+                prefix = rel + os.sep
+                gone.update(r for r in indexed if r.startswith(prefix))
+
+        for rel in seen:
+            path = os.path.join(root, rel)
+            try:
+                st = os.stat(path)
+            except OSError:
+                gone.add(rel)
+                continue
+            # Same mtime/size as indexed: nothing to do
+            if rel in indexed and cache.lookup(rel, st) is not None:
+                continue
+            pending.append((rel, path, os.path.basename(rel), st))
+
+        entries = {}
+        for rel, entry, _ in ingest_files(pending, cache, workers=1):
+            if entry is None:
+                gone.add(rel)
+            else:
+                entries[rel] = entry
+        if not entries and not gone:
+            return
+
+        if semantic:
+            blocks = [(rel, block, name, (start, end))
+                      for rel, entry in entries.items() for name, block, start, end in entry["blocks"]]
+            try:
+                embed_missing(self.client, vectors, blocks)
+            except (requests.RequestException, KeyError, ValueError) as e:
+                print(f"\n{C['yellow']}Could not embed changed files ({e}): semantic search is off.{C['reset']}")
+                with self.project_lock:
+                    if self.project_generation == generation:
+                        self.semantic = None
+
+        with self.project_lock:
+            if self.project_generation != generation:
+                return
+            for rel in gone | entries.keys():
+                self._unregister_project_file(rel)
+            for rel, entry in entries.items():
+                self._register_project_file(rel, entry)
+
+    def _embed_question(self, question):
+        # An HTTP call: made before taking project_lock, so a slow embed server
+        # never holds up the watcher or /project list
+        try:
+            return self.client.embed([question], CONFIG["embed_model"])[0]
+        except (requests.RequestException, KeyError, IndexError, ValueError) as e:
+            print(f"{C['yellow']}Semantic search unavailable ({e}), using keyword search.{C['reset']}")
+            return None
+
+    def _semantic_search(self, query_vector, keyword_scored):
+        scored = self.semantic.search(query_vector)
+        if CONFIG["semantic_fusion"]:
+            scored = fuse(scored, keyword_scored)
+        return scored
+
     # --- MAIN CHAT LOOP ---
     def chat(self):
         short_commands = {
@@ -229,8 +409,7 @@ class FerretAI(FerretAIInit):
         }
         while True:
             try:
-                ctx_size = len(self.messages) - 1
-                prompt = f"{self._context_bar(ctx_size)}\n{C['prompt']} λ{C['reset']} "
+                prompt = f"{self._context_bar()}\n{C['prompt']} λ{C['reset']} "
                 first_line = input(prompt).strip()
                 if not first_line:
                     continue
@@ -242,6 +421,7 @@ class FerretAI(FerretAIInit):
                         break
 
                 cmd = first_line.lower()
+                cache_id = None
 
                 # --- EXIT ---
                 if cmd == '/exit':
@@ -263,6 +443,7 @@ class FerretAI(FerretAIInit):
                 # --- CLEAR CONTEXT ---
                 if cmd == '/clear':
                     self.messages = [{"role": "system", "content": CONFIG["persona"]}]
+                    self.context.reset(self.messages)
                     self.code_blocks = []
                     self._setup_env()
                     print(f"{C['brand']}🗑️ Context purged. Memory fresh.{C['reset']}\n")
@@ -294,11 +475,14 @@ class FerretAI(FerretAIInit):
                     if len(cmd.split()) == 2 and cmd.split()[1].isdigit():
                         idx = int(cmd.split()[1]) - 1
                         if 0 <= idx < len(self.code_blocks):
-                            if CLIPBOARD_ENABLED:
-                                pyperclip.copy(self.code_blocks[idx])
-                                print(f"{C['green']}Copied code block {idx+1} ✅{C['reset']}")
-                            else:
+                            # Imported on first use: keeps it off the startup path
+                            try:
+                                import pyperclip
+                            except ImportError:
                                 print(f"{C['yellow']}pyperclip not installed.{C['reset']}")
+                                continue
+                            pyperclip.copy(self.code_blocks[idx])
+                            print(f"{C['green']}Copied code block {idx+1} ✅{C['reset']}")
                         else:
                             print(f"{C['yellow']}Invalid code block number.{C['reset']}")
                     else:
@@ -309,7 +493,7 @@ class FerretAI(FerretAIInit):
                 elif cmd.startswith('/project'):
                     parts = first_line.split(maxsplit=2)
                     if len(parts) == 1:
-                        print(f"{C['yellow']}Usage: /project add|remove|list|ask{C['reset']}")
+                        print(f"{C['yellow']}Usage: /project add|remove|list|ask|watch{C['reset']}")
                         continue
                     sub = parts[1]
 
@@ -322,59 +506,38 @@ class FerretAI(FerretAIInit):
                         if not os.path.isdir(folder):
                             print(f"{C['error']}Directory not found.{C['reset']}")
                             continue
-                        self.project_root = folder
-                        self.project_index = {}
-                        self.project_chunks = []
-                        self.project_blocks = []
-                        self.symbol_index = {}
-                        print(f"{C['info']}Indexing project with symbol extraction...{C['reset']}")
-                        allowed_ext = (".py", ".js", ".jsx", ".ts", ".html", ".css", ".json", ".lua", ".c", ".cpp", ".md")
-                        for root, _, files in os.walk(folder):
-                            for file in files:
-                                if not file.endswith(allowed_ext):
-                                    continue
-                                path = os.path.join(root, file)
-                                rel = os.path.relpath(path, folder)
-                                try:
-                                    with open(path, "r", encoding="utf-8") as f:
-                                        content = f.read()
-                                except:
-                                    continue
-
-                                imports = self._extract_imports(content)
-                                blocks = self._extract_python_blocks(content) if file.endswith(".py") else [("file_scope", content[:8000])]
-                                self.project_index[rel] = {"chunks": self._chunk_text(content), "size": len(content), "blocks": blocks, "imports": imports}
-
-                                for name, block in blocks:
-                                    self.project_blocks.append((rel, block, name))
-                                    if name:
-                                        self.symbol_index.setdefault(name, []).append((rel, block))
-                                for chunk in self.project_index[rel]["chunks"]:
-                                    self.project_chunks.append((rel, chunk))
-
-                        print(f"{C['green']}Indexed {len(self.project_index)} files, {len(self.project_blocks)} code blocks.{C['reset']}")
+                        self._index_project(folder)
                         continue
 
                     # --- REMOVE PROJECT ---
                     elif sub == "remove":
-                        self.project_root = None
-                        self.project_index = {}
-                        self.project_chunks = []
-                        self.project_blocks = []
-                        self.symbol_index = {}
+                        self._reset_project()
                         print(f"{C['brand']}Project removed.{C['reset']}")
                         continue
 
                     # --- LIST PROJECT FILES ---
                     elif sub == "list":
-                        if not self.project_index:
+                        with self.project_lock:
+                            files = list(self.project_index)
+                        if not files:
                             print(f"{C['yellow']}No project loaded.{C['reset']}")
                         else:
                             print(f"{C['info']}Project files:{C['reset']}")
-                            for file in self.project_index.keys():
+                            for file in files:
                                 print(f" - {file}")
                         continue
 
+                    # --- WATCH PROJECT ---
+                    elif sub == "watch":
+                        if self.project_root is None:
+                            print(f"{C['yellow']}No project loaded.{C['reset']}")
+                        elif self.watcher is None:
+                            self._start_watch()
+                        else:
+                            self._stop_watch()
+                            print(f"{C['brand']}Stopped watching {self.project_root}.{C['reset']}")
+                        continue
+
                     # --- ASK PROJECT ---
                     elif sub == "ask":
                         if not self.project_blocks:
@@ -385,28 +548,26 @@ class FerretAI(FerretAIInit):
                             continue
                         question = parts[2]
                         traceback_file = self._detect_traceback_target(question)
-                        scored = []
-
-                        for path, block, name in self.project_blocks:
-                            score = self._score_block(question, block, name)
-                            if traceback_file and traceback_file in path:
-                                score += 20
-                            if score > 0:
-                                scored.append((score, path, block, name))
-
-                        if not scored:
-                            print(f"{C['yellow']}No strong matches found. Using top blocks.{C['reset']}")
-                            scored = [(1, p, b, n) for p, b, n in self.project_blocks[:5]]
+                        if self.watcher is not None:
+                            self.watcher.flush()  # saves still inside the debounce window
+                        query_vector = self._embed_question(question) if self.semantic is not None else None
+                        with self.project_lock:
+                            scored = self.retriever.search(question, traceback_file=traceback_file)
+                            if self.semantic is not None and query_vector is not None:
+                                scored = self._semantic_search(query_vector, scored)
+
+                            if not scored:
+                                print(f"{C['yellow']}No strong matches found. Using top blocks.{C['reset']}")
+                                scored = [(1, *entry) for entry in islice(self.project_blocks, 5)]
 
-                        scored.sort(reverse=True, key=lambda x: x[0])
                         MAX_CONTEXT = 12000
                         used = 0
                         injection = ""
                         used_files = set()
-                        for score, path, block, name in scored:
+                        for score, path, block, name, (start, end) in scored:
                             if used + len(block) > MAX_CONTEXT:
                                 break
-                            injection += f"\n[File: {path} | Symbol: {name} | Score: {score}]\n```\n{block}\n```\n"
+                            injection += f"\n[File: {path}:{start}-{end} | Symbol: {name} | Score: {score}]\n```\n{block}\n```\n"
                             used += len(block)
                             used_files.add(path)
 
@@ -416,6 +577,8 @@ class FerretAI(FerretAIInit):
                 # --- FILE COMMANDS ---
                 elif cmd.startswith('/file'):
                     parts = first_line.split()
+                    no_cache = "--no-cache" in parts
+                    parts = [p for p in parts if p != "--no-cache"]
                     if len(parts) < 2:
                         print(f"{C['yellow']}Usage: /file <path>{C['reset']}")
                         continue
@@ -438,24 +601,13 @@ class FerretAI(FerretAIInit):
                     except Exception as e:
                         print(f"{C['error']}Could not read file: {e}{C['reset']}")
                         continue
-                    max_chars = 15000
-                    if len(content) > max_chars:
-                        print(f"{C['yellow']}File too large. Truncating to {max_chars} characters.{C['reset']}")
-                        content = content[:max_chars]
+                    if len(content) > MAX_FILE_CHARS:
+                        print(f"{C['yellow']}File too large. Truncating to {MAX_FILE_CHARS} characters.{C['reset']}")
+                        content = content[:MAX_FILE_CHARS]
                     filename = os.path.basename(file_path)
-                    if mode == "summary":
-                        prompt_prefix = "Provide a concise summary of this file."
-                    elif mode == "explain":
-                        prompt_prefix = "Explain in detail what this file does, including architecture and logic."
-                    elif mode == "refactor":
-                        prompt_prefix = (
-                            "Refactor and improve this file. "
-                            "Improve readability, structure, and performance. "
-                            "Return the improved full code."
-                        )
-                    else:
-                        prompt_prefix = f"Here is the content of file `{filename}`:"
-                    user_input = f"{prompt_prefix}\n\nFile name: `{filename}`\n\n```\n{content}\n```"
+                    user_input = file_prompt(filename, content, mode)
+                    if mode in FILE_PROMPTS and not no_cache:
+                        cache_id = cache_key(CONFIG["model"], mode, user_input)
                     print(f"{C['green']}Loaded file: {filename} ({len(content)} chars) | Mode: {mode}{C['reset']}")
 
                 else:
@@ -463,70 +615,38 @@ class FerretAI(FerretAIInit):
 
                 # --- SEND TO AI ---
                 self.messages.append({"role": "user", "content": user_input})
-                stop_event = threading.Event()
-                spinner_thread = threading.Thread(target=_typing_indicator, args=(stop_event,))
-                spinner_thread.start()
+                cached = self.response_cache.get(cache_id) if cache_id else None
+                if cached is not None:
+                    # Same model, mode and file content: replay the stored answer
+                    print(f"{C['info']}Cached analysis (file unchanged). Use --no-cache to regenerate.{C['reset']}")
+                    stream_lines = replay_lines(cached)
+                else:
+                    stop_event = threading.Event()
+                    spinner_thread = threading.Thread(target=_typing_indicator, args=(stop_event,))
+                    spinner_thread.start()
+
+                    try:
+                        response = self.client.chat(self.context.build(), options={"num_ctx": CONFIG["num_ctx"]}, sid="terminal")
+                    except requests.exceptions.RequestException as e:
+                        stop_event.set()
+                        spinner_thread.join()
+                        print(f"\n{C['error']}Network error: {e}{C['reset']}")
+                        continue
 
-                try:
-                    response = requests.post(
-                        CONFIG["url"],
-                        json={"model": CONFIG["model"], "messages": self.messages, "stream": True},
-                        stream=True,
-                        timeout=20
-                    )
-                    response.raise_for_status()
-                except requests.exceptions.RequestException as e:
                     stop_event.set()
                     spinner_thread.join()
-                    print(f"\n{C['error']}Network error: {e}{C['reset']}")
-                    continue
-
-                stop_event.set()
-                spinner_thread.join()
+                    stream_lines = response.iter_lines()
                 print(f"\n{C['ai']}•ᴗ•{C['reset']} ", end="")
 
-                full_response = ""
-                in_code_block = False
-                code_buffer = ""
-                for line in response.iter_lines():
-                    if not line:
-                        continue
-                    chunk = json.loads(line.decode("utf-8"))
-                    content = chunk.get("message", {}).get("content", "")
-                    full_response += content
-                    while content:
-                        if content.startswith("```"):
-                            in_code_block = not in_code_block
-                            content = content[3:]
-                            if not in_code_block and code_buffer:
-                                code_text = "```\n" + code_buffer + "\n```"
-                                self._render_code_block(code_text)
-                                self.code_blocks.append(self._render_code_block(code_text, show_gutter=False))
-                                code_buffer = ""
-                            continue
-                        if in_code_block:
-                            newline_pos = content.find("\n")
-                            if newline_pos != -1:
-                                code_buffer += content[:newline_pos] + "\n"
-                                content = content[newline_pos+1:]
-                            else:
-                                code_buffer += content
-                                content = ""
-                        else:
-                            for char in content:
-                                sys.stdout.write(char)
-                                sys.stdout.flush()
-                                time.sleep(CONFIG["typing_speed"])
-                            content = ""
-
-                if code_buffer.strip():
-                    code_text = "```\n" + code_buffer.strip() + "\n```"
-                    self._render_code_block(code_text)
-                    self.code_blocks.append(self._render_code_block(code_text, show_gutter=False))
+                full_response = self._render_stream(stream_lines)
 
                 print("\n")
+                if cache_id and cached is None and full_response:
+                    self.response_cache.put(cache_id, full_response)
                 self.log_interaction(user_input, full_response)
                 self.messages.append({"role": "assistant", "content": full_response})
+                # Fold older turns into the rolling summary while the user types
+                self.context.compact_async()
 
             except KeyboardInterrupt:
                 print(f"\n{C['yellow']}Interrupted.{C['reset']}")
@@ -0,0 +1,82 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import os
+import json
+import hashlib
+from .config import CONFIG
+
+CACHE_VERSION = 2
+
+
+def content_digest(content):
+    return hashlib.sha1(content.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+# --- ON-DISK PROJECT INDEX CACHE ---
+class ProjectIndexCache:
+    """Per-project cache of parsed file entries, keyed by project root.
+
+    Each file is stored with its mtime/size so an unchanged file costs one
+    stat, and with its content hash so a touched-but-identical file is not
+    re-parsed.
+    """
+
+    def __init__(self, root, cache_dir=None):
+        self.root = os.path.realpath(root)
+        self.cache_dir = cache_dir or CONFIG["index_cache_dir"]
+        key = hashlib.sha1(self.root.encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(self.cache_dir, f"project_{key}.json")
+        self.files = {}
+        self.dirty = False
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != CACHE_VERSION or data.get("root") != self.root:
+            return
+        self.files = data.get("files", {})
+
+    def save(self):
+        if not self.dirty:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "root": self.root, "files": self.files}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def lookup(self, rel, st):
+        cached = self.files.get(rel)
+        if cached and cached["mtime"] == st.st_mtime_ns and cached["size"] == st.st_size:
+            return self._decode(cached["entry"])
+        return None
+
+    def lookup_digest(self, rel, st, digest):
+        cached = self.files.get(rel)
+        if not cached or cached["hash"] != digest:
+            return None
+        # Content is identical, only the stat changed: refresh it.
+        cached["mtime"], cached["size"] = st.st_mtime_ns, st.st_size
+        self.dirty = True
+        return self._decode(cached["entry"])
+
+    def store(self, rel, st, digest, entry):
+        self.files[rel] = {"mtime": st.st_mtime_ns, "size": st.st_size, "hash": digest, "entry": entry}
+        self.dirty = True
+
+    def prune(self, seen):
+        removed = [rel for rel in self.files if rel not in seen]
+        for rel in removed:
+            del self.files[rel]
+        if removed:
+            self.dirty = True
+        return removed
+
+    def _decode(self, entry):
+        entry = dict(entry)
+        entry["blocks"] = [tuple(block) for block in entry["blocks"]]
+        return entry
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
@@ -0,0 +1,114 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from .config import CONFIG
+from .index_cache import content_digest
+from .chunker import chunk_file
+
+# Below this many files the process pool start-up costs more than it saves
+PROCESS_POOL_MIN_FILES = 32
+
+
+# --- FILE PARSING (module level so worker processes can pickle it) ---
+def chunk_text(text, size=1200, overlap=200):
+    chunks, start = [], 0
+    while start < len(text):
+        end = start + size
+        chunks.append(text[start:end])
+        start += size - overlap
+    return chunks
+
+
+def extract_imports(content):
+    imports = []
+    for line in content.splitlines():
+        if line.strip().startswith(("import ", "from ")):
+            imports.append(line.strip())
+    return imports
+
+
+def parse_file(file, content):
+    imports = extract_imports(content)
+    blocks = chunk_file(file, content)
+    return {"chunks": chunk_text(content), "size": len(content), "blocks": blocks, "imports": imports}
+
+
+def read_source(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+    except (OSError, UnicodeDecodeError):
+        return None, None
+    return content, content_digest(content)
+
+
+# --- PARALLEL INGESTION ---
+def _make_process_pool(workers):
+    try:
+        return ProcessPoolExecutor(max_workers=workers)
+    except (OSError, NotImplementedError):
+        return None
+
+
+def _collect(parsing, futures, cache):
+    for future in futures:
+        rel, file, st, digest, content = parsing.pop(future)
+        try:
+            entry = future.result()
+        except Exception:
+            # Broken worker pool: parse here instead of dropping the file
+            entry = parse_file(file, content)
+        cache.store(rel, st, digest, entry)
+        yield rel, entry, True
+
+
+def ingest_files(pending, cache, workers=None):
+    """Read, hash and parse ``pending`` (rel, path, file, stat) tuples.
+
+    Reads run on a thread pool, parsing on a process pool, and the cache is
+    only touched from the calling thread. Only a window of files is read or
+    parsed at a time, so memory does not grow with the project. Yields
+    ``(rel, entry, parsed)`` as files finish; ``entry`` is None for
+    unreadable files.
+    """
+    workers = max(1, workers or CONFIG["index_workers"])
+    window = workers * 4
+    cpu_pool = None
+    if workers > 1 and len(pending) >= PROCESS_POOL_MIN_FILES:
+        cpu_pool = _make_process_pool(workers)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as io_pool:
+            parsing, reads, queue = {}, deque(), iter(pending)
+            while True:
+                while len(reads) < window:
+                    item = next(queue, None)
+                    if item is None:
+                        break
+                    reads.append((item, io_pool.submit(read_source, item[1])))
+                if not reads:
+                    break
+                (rel, path, file, st), read = reads.popleft()
+                content, digest = read.result()
+                if content is None:
+                    yield rel, None, False
+                    continue
+                entry = cache.lookup_digest(rel, st, digest)
+                if entry is not None:
+                    yield rel, entry, False
+                    continue
+                if cpu_pool is None:
+                    entry = parse_file(file, content)
+                    cache.store(rel, st, digest, entry)
+                    yield rel, entry, True
+                    continue
+                parsing[cpu_pool.submit(parse_file, file, content)] = (rel, file, st, digest, content)
+                if len(parsing) >= window:
+                    finished, _ = wait(parsing, return_when=FIRST_COMPLETED)
+                    yield from _collect(parsing, finished, cache)
+
+            yield from _collect(parsing, as_completed(list(parsing)), cache)
+    finally:
+        if cpu_pool is not None:
+            cpu_pool.shutdown(cancel_futures=True)
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
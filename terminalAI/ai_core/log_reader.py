@@ -0,0 +1,167 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import os
+import gzip
+import time
+import threading
+from collections import deque
+from datetime import datetime
+
+BLOCK_SIZE = 64 * 1024
+LINE_CHECKPOINT = 4096  # remember the byte offset of every Nth line
+LISTING_TTL = 5.0
+
+
+def _decode(data):
+    # Drop a partial UTF-8 sequence cut off at the front of a raw byte window
+    start = 0
+    while start < min(len(data), 4) and (data[start] & 0xC0) == 0x80:
+        start += 1
+    return data[start:].decode("utf-8", errors="replace")
+
+
+# --- TAIL READS (cost depends on the request, not the file) ---
+def tail_text(path, max_chars):
+    """Last ``max_chars`` characters (approximately: bytes) of a log file."""
+    if path.endswith(".gz"):
+        tail = deque(maxlen=max_chars)
+        with gzip.open(path, "rb") as f:
+            for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+                tail.extend(block)
+        return _decode(bytes(tail))
+
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        start = max(size - max_chars, 0)
+        f.seek(start)
+        data = f.read()
+    if start and b"\n" in data[:-1]:
+        data = data[data.index(b"\n") + 1:]  # start on a whole line
+    return _decode(data)
+
+
+def tail_lines(path, count):
+    """Last ``count`` lines, read backwards block by block from the end."""
+    if path.endswith(".gz"):
+        with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
+            return list(deque(f, maxlen=count))
+
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= count:
+            step = min(BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.decode("utf-8", errors="replace").splitlines(keepends=True)
+    return lines[-count:] if count else []
+
+
+# --- PAGINATION ---
+class LineIndex:
+    """Sparse line -> byte offset checkpoints per file, extended as logs grow."""
+
+    def __init__(self):
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def _checkpoints(self, path, st):
+        # Logs are append-only: keep what we know unless the file shrank
+        with self._lock:
+            known = self._files.get(path)
+            if known is None or st.st_size < known["size"]:
+                known = {"size": 0, "offsets": [0]}
+                self._files[path] = known
+            return known
+
+    def read_lines(self, path, start, count):
+        """Return ``count`` lines starting at 1-based line ``start``.
+
+        A negative ``start`` counts from the end (``-1`` is the last line).
+        """
+        if start < 0:
+            lines = tail_lines(path, -start)
+            return lines[:count]
+        if path.endswith(".gz"):
+            with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
+                return [line for i, line in enumerate(f, 1) if start <= i < start + count]
+
+        st = os.stat(path)
+        known = self._checkpoints(path, st)
+        target = max(start, 1) - 1
+        with open(path, "rb") as f:
+            with self._lock:
+                slot = min(target // LINE_CHECKPOINT, len(known["offsets"]) - 1)
+                line_no, offset = slot * LINE_CHECKPOINT, known["offsets"][slot]
+            f.seek(offset)
+
+            out = []
+            for raw in f:
+                if line_no >= target + count:
+                    break
+                if line_no >= target:
+                    out.append(raw.decode("utf-8", errors="replace"))
+                offset += len(raw)
+                line_no += 1
+                if line_no % LINE_CHECKPOINT == 0:
+                    with self._lock:
+                        if line_no // LINE_CHECKPOINT == len(known["offsets"]):
+                            known["offsets"].append(offset)
+            with self._lock:
+                known["size"] = max(known["size"], st.st_size)
+        return out
+
+
+# --- CACHED DIRECTORY LISTING ---
+class LogDirectory:
+    """Listing of ``*.txt``/``*.txt.gz`` logs, refreshed when the folder changes."""
+
+    def __init__(self, log_dir, suffixes=(".txt", ".txt.gz"), ttl=LISTING_TTL):
+        self.log_dir = str(log_dir)
+        self.suffixes = suffixes
+        self.ttl = ttl
+        self._entries = None
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def entries(self):
+        """``[(name, size, mtime), ...]`` sorted by name."""
+        try:
+            dir_mtime = os.stat(self.log_dir).st_mtime_ns
+        except OSError:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            # New or removed files change the folder mtime; appends only change
+            # sizes, which the TTL bounds.
+            if self._entries is not None and self._stamp[0] == dir_mtime and now - self._stamp[1] < self.ttl:
+                return self._entries
+
+        entries = []
+        with os.scandir(self.log_dir) as it:
+            for entry in it:
+                if entry.name.endswith(self.suffixes) and entry.is_file():
+                    st = entry.stat()
+                    entries.append((entry.name, st.st_size, st.st_mtime))
+        entries.sort()
+
+        with self._lock:
+            self._entries, self._stamp = entries, (dir_mtime, now)
+        return entries
+
+    def listing(self):
+        lines = []
+        for name, size, mtime in self.entries():
+            lines.append(f"{name}  {format_size(size)}  {datetime.fromtimestamp(mtime):%Y-%m-%d %H:%M}")
+        return "\n".join(lines)
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
@@ -0,0 +1,160 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import re
+import gzip
+import tempfile
+import threading
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .config import CONFIG
+from .ollama_client import get_client
+
+# Entries are framed by the log writers as "[HH:MM:SS] USER: ..." then "[HH:MM:SS] AI: ..."
+ENTRY_START_RE = re.compile(rb"^\[\d{2}:\d{2}:\d{2}\] USER: ")
+
+MAP_PROMPT = (
+    "You are reading one part of a longer chat log. "
+    "List the key events, errors and decisions in this part, with their timestamps. "
+    "Be concise; this will be merged with the summaries of the other parts."
+)
+COMBINE_PROMPT = (
+    "Merge these partial log summaries, in order, into one shorter summary. "
+    "Keep timestamps, errors and recurring patterns."
+)
+REDUCE_PROMPT = (
+    "Below are summaries of consecutive parts of one application log, in order. "
+    "Summarize key events, detect errors, and highlight patterns across the whole log."
+)
+
+
+# --- ENTRY-ALIGNED CHUNKS ---
+class LogChunks(Sequence):
+    """A log file cut into chunks of whole entries, each at most ``max_chars`` bytes.
+
+    Only byte offsets are kept, so each chunk is read when it is summarized.
+    Gzipped archives can't seek: they are decompressed once into a temporary
+    file, which ``close()`` removes.
+    """
+
+    def __init__(self, path, max_chars):
+        self.path = str(path)
+        self.max_chars = max_chars
+        self.spans = []
+        self._spool = tempfile.TemporaryFile() if self.path.endswith(".gz") else None
+        self._lock = threading.Lock()  # chunks are read from several map workers
+        self._scan()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._spool is not None:
+            self._spool.close()
+
+    def _scan(self):
+        opener = gzip.open if self._spool is not None else open
+        start = pos = 0
+        entry_at = 0  # where the newest entry inside the current chunk starts
+        with opener(self.path, "rb") as f:
+            for line in f:
+                if ENTRY_START_RE.match(line):
+                    entry_at = pos
+                if pos > start and pos - start + len(line) > self.max_chars:
+                    # Cut before the entry that overflows; split mid-entry only
+                    # when one entry is bigger than a whole chunk.
+                    cut = entry_at if entry_at > start else pos
+                    self.spans.append((start, cut))
+                    start = cut
+                if self._spool is not None:
+                    self._spool.write(line)
+                pos += len(line)
+        if pos > start:
+            self.spans.append((start, pos))
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __getitem__(self, index):
+        start, end = self.spans[index]
+        if self._spool is not None:
+            with self._lock:
+                self._spool.seek(start)
+                data = self._spool.read(end - start)
+        else:
+            with open(self.path, "rb") as f:
+                f.seek(start)
+                data = f.read(end - start)
+        return data.decode("utf-8", errors="replace")
+
+
+# --- MAP / REDUCE ---
+def ollama_chunk_summarizer(url=None, model=None, num_ctx=None, timeout=120, client=None):
+    # url None: get_client uses CONFIG["backends"] when set, else CONFIG["url"]
+    model = model or CONFIG["model"]
+    num_ctx = num_ctx or CONFIG["num_ctx"]
+
+    def summarize(prompt, text):
+        response = (client or get_client(url, model)).chat(
+            [
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": text},
+            ],
+            stream=False,
+            options={"num_ctx": num_ctx},
+            read_timeout=timeout,
+        )
+        return response.json().get("message", {}).get("content", "").strip()
+
+    return summarize
+
+
+def _run_parallel(jobs, summarize, workers, stage):
+    # jobs: [(prompt, load_text)]; yields progress, returns results in job order
+    results = [None] * len(jobs)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"log-{stage}")
+    try:
+        futures = {executor.submit(lambda p=prompt, l=load: summarize(p, l())): i for i, (prompt, load) in enumerate(jobs)}
+        yield {"stage": stage, "done": 0, "total": len(jobs)}
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                results[i] = f"(part {i + 1} could not be summarized: {e})"
+            yield {"stage": stage, "done": done, "total": len(jobs)}
+    finally:
+        # Stop queued work if the client went away mid-stream
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def map_reduce(chunks, summarize, workers=4, budget_chars=12000):
+    """Summarize ``chunks`` with at most ``workers`` requests in flight.
+
+    Yields progress dicts; returns the text for the final (streamed) reduce step,
+    after merging partial summaries until they fit in ``budget_chars``.
+    """
+    jobs = [(MAP_PROMPT, lambda i=i: chunks[i]) for i in range(len(chunks))]
+    summaries = yield from _run_parallel(jobs, summarize, workers, "map")
+    summaries = [f"[Part {i}/{len(summaries)}]\n{s}" for i, s in enumerate(summaries, 1)]
+
+    while len(summaries) > 1 and sum(len(s) + 2 for s in summaries) > budget_chars:
+        groups, group, size = [], [], 0
+        for s in summaries:
+            if group and size + len(s) > budget_chars:
+                groups.append(group)
+                group, size = [], 0
+            group.append(s)
+            size += len(s) + 2
+        groups.append(group)
+        if len(groups) == len(summaries):
+            # Every summary is a group on its own: no merging would make progress
+            summaries = [s[: budget_chars // len(summaries)] for s in summaries]
+            break
+        jobs = [(COMBINE_PROMPT, lambda g=g: "\n\n".join(g)) for g in groups]
+        summaries = yield from _run_parallel(jobs, summarize, workers, "combine")
+
+    return "\n\n".join(summaries)
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
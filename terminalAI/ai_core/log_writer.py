@@ -0,0 +1,169 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import os
+import re
+import gzip
+import time
+import queue
+import atexit
+import shutil
+import threading
+from datetime import datetime
+from .config import CONFIG
+
+_STOP = object()
+_FLUSH = object()  # ends the current batch window at once
+
+
+# --- BACKGROUND LOG WRITER ---
+class LogWriter:
+    """Append chat entries to ``<prefix>_<YYYYMMDD>.txt`` from a background thread.
+
+    Entries are queued by ``write()`` and flushed in batches (by count or
+    time). Files rotate by day and by size; closed files can be gzipped and,
+    when a retention window is set, files older than it are deleted.
+    """
+
+    def __init__(self, log_dir, prefix, separator="-" * 40, batch_size=None, flush_interval=None,
+                 max_bytes=None, compress=None, retention_days=None, on_batch=None):
+        self.log_dir = str(log_dir)
+        self.prefix = prefix
+        self.separator = separator
+        self.batch_size = batch_size or CONFIG["log_batch_size"]
+        self.flush_interval = flush_interval or CONFIG["log_flush_interval"]
+        self.max_bytes = max_bytes or CONFIG["log_max_bytes"]
+        self.compress = CONFIG["log_compress"] if compress is None else compress
+        self.retention_days = CONFIG["log_retention_days"] if retention_days is None else retention_days
+        # Called with (seconds, entries) after each batch reaches the disk
+        self.on_batch = on_batch
+        self.name_re = re.compile(rf"^{re.escape(prefix)}_(\d{{8}})(?:\.(\d+))?\.txt(\.gz)?$")
+
+        self._queue = queue.Queue()
+        self._fh = None
+        self._day = None
+        self._thread = threading.Thread(target=self._run, name=f"log-writer-{prefix}", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def path_for(self, day):
+        return os.path.join(self.log_dir, f"{self.prefix}_{day}.txt")
+
+    def current_path(self):
+        return self.path_for(datetime.now().strftime("%Y%m%d"))
+
+    def write(self, user_text, ai_text):
+        now = datetime.now()
+        timestamp = now.strftime("%H:%M:%S")
+        entry = f"[{timestamp}] USER: {user_text}\n[{timestamp}] AI: {ai_text}\n{self.separator}\n"
+        self._queue.put((now.strftime("%Y%m%d"), entry))
+
+    def flush(self):
+        # Block until everything queued so far is on disk, without waiting out the batch window
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout=5)
+
+    # --- writer thread ---
+    def _run(self):
+        self._maintenance()
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not _STOP and batch[-1] is not _FLUSH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            entries = [item for item in batch if item is not _STOP and item is not _FLUSH]
+            try:
+                started = time.perf_counter()
+                self._write_batch(entries)
+                if self.on_batch and entries:
+                    self.on_batch(time.perf_counter() - started, len(entries))
+            except Exception:
+                self._close_file()  # logging must never take the app down; reopen next batch
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if batch[-1] is _STOP:
+                self._close_file()
+                return
+
+    def _write_batch(self, batch):
+        by_day = {}
+        for day, entry in batch:
+            by_day.setdefault(day, []).append(entry)
+
+        for day, entries in by_day.items():
+            data = "".join(entries).encode("utf-8")
+            if day != self._day or self._fh is None:
+                self._open(day)
+            if self._fh.tell() and self._fh.tell() + len(data) > self.max_bytes:
+                self._rotate(day)
+            self._fh.write(data)
+            self._fh.flush()
+
+    def _close_file(self):
+        if self._fh:
+            try:
+                self._fh.close()
+            except OSError:
+                pass
+        self._fh = None
+
+    def _open(self, day):
+        self._close_file()
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._fh = open(self.path_for(day), "ab")
+        previous, self._day = self._day, day
+        if previous is not None and previous != day:
+            self._maintenance()
+
+    def _rotate(self, day):
+        self._close_file()
+        active = self.path_for(day)
+        index = 1
+        while any(os.path.exists(os.path.join(self.log_dir, f"{self.prefix}_{day}.{index}.txt{ext}"))
+                  for ext in ("", ".gz")):
+            index += 1
+        rotated = os.path.join(self.log_dir, f"{self.prefix}_{day}.{index}.txt")
+        os.replace(active, rotated)
+        if self.compress:
+            self._gzip(rotated)
+        self._fh = open(active, "ab")
+
+    def _gzip(self, path):
+        with open(path, "rb") as src, gzip.open(path + ".gz", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        shutil.copystat(path, path + ".gz")  # keep the age retention is measured by
+        os.remove(path)
+
+    def _maintenance(self):
+        # Compress closed days and drop files past the retention window
+        try:
+            names = os.listdir(self.log_dir)
+        except OSError:
+            return
+        today = datetime.now().strftime("%Y%m%d")
+        cutoff = time.time() - (self.retention_days or 0) * 86400
+        for name in names:
+            m = self.name_re.match(name)
+            if not m:
+                continue
+            path = os.path.join(self.log_dir, name)
+            try:
+                if self.retention_days and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                elif self.compress and not m.group(3) and m.group(1) not in (today, self._day):
+                    self._gzip(path)
+            except OSError:
+                continue
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
@@ -0,0 +1,222 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import json
+import time
+import logging
+import threading
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+RATE_BUCKETS = (1, 2.5, 5, 10, 20, 35, 50, 75, 100, 250, 500, 1000, 2500)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+
+timing_log = logging.getLogger("ferret.timing")
+
+
+# --- MINIMAL PROMETHEUS METRICS (text exposition format 0.0.4) ---
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help_text, labels=(), registry=None):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._samples(key, value))
+        return lines
+
+    def _samples(self, key, value):
+        return [f"{self.name}{_label_text(self.labels, key)} {_number(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labels=(), registry=None, fn=None):
+        super().__init__(name, help_text, labels, registry)
+        self.fn = fn  # sampled at scrape time, for values owned elsewhere
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def render(self):
+        if self.fn is not None:
+            try:
+                self.set(self.fn())
+            except Exception:
+                pass
+        return super().render()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), registry=None, buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels, registry)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+                    break
+            state["sum"] += value
+            state["count"] += 1
+
+    def _samples(self, key, state):
+        lines, running = [], 0
+        for bound, count in zip(self.buckets, state["counts"]):
+            running += count
+            le = _label_text(self.labels, key, [("le", _number(bound))])
+            lines.append(f"{self.name}_bucket{le} {running}")
+        labels = _label_text(self.labels, key)
+        lines.append(f"{self.name}_sum{labels} {_number(state['sum'])}")
+        lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# --- FERRET METRICS (per process) ---
+REQUESTS = Counter("ferret_requests_total", "Chat and /log requests by outcome.", ["endpoint", "outcome"])
+TTFT = Histogram("ferret_time_to_first_token_seconds", "Request start to first streamed token.", ["endpoint"])
+DURATION = Histogram("ferret_request_duration_seconds", "Request start to end of stream.", ["endpoint", "outcome"])
+PROMPT_EVAL_RATE = Histogram(
+    "ferret_prompt_eval_tokens_per_second", "Ollama prompt evaluation speed.", buckets=RATE_BUCKETS
+)
+EVAL_RATE = Histogram("ferret_eval_tokens_per_second", "Ollama generation speed.", buckets=RATE_BUCKETS)
+ACTIVE_STREAMS = Gauge("ferret_active_streams", "Responses currently streaming.")
+SESSIONS = Gauge("ferret_sessions", "Sessions held by the session store.")
+QUEUED = Gauge("ferret_queued_requests", "Requests waiting for a generation slot.")
+QUEUE_WAIT = Histogram("ferret_queue_wait_seconds", "Time a request waited for a generation slot.", ["endpoint"])
+LOG_WRITE = Histogram("ferret_log_write_seconds", "Time to write one batch of chat log entries.", buckets=FAST_BUCKETS)
+
+
+# --- PER-REQUEST TIMER ---
+def record_request(endpoint, outcome, started, **fields):
+    duration = time.perf_counter() - started
+    REQUESTS.inc(endpoint=endpoint, outcome=outcome)
+    DURATION.observe(duration, endpoint=endpoint, outcome=outcome)
+    if timing_log.isEnabledFor(logging.INFO):
+        record = {"endpoint": endpoint, "outcome": outcome, "duration_s": round(duration, 4), **fields}
+        timing_log.info(json.dumps(record))
+
+
+class RequestTimer:
+    """Times one streamed response and records it when ``finish()`` is called.
+
+    Create it where the stream actually starts, so ``ferret_active_streams``
+    only counts responses that are being produced.
+    """
+
+    def __init__(self, endpoint, cached=False, started=None):
+        self.endpoint = endpoint
+        self.cached = cached
+        self.started = started or time.perf_counter()
+        self.ttft = None
+        self.stats = {}
+        self._finished = False
+        ACTIVE_STREAMS.inc()
+
+    def token(self):
+        if self.ttft is None:
+            self.ttft = time.perf_counter() - self.started
+            TTFT.observe(self.ttft, endpoint=self.endpoint)
+
+    def model_stats(self, chunk):
+        # Ollama's final chunk: durations are in nanoseconds
+        for count_key, duration_key, histogram in (
+            ("prompt_eval_count", "prompt_eval_duration", PROMPT_EVAL_RATE),
+            ("eval_count", "eval_duration", EVAL_RATE),
+        ):
+            count, duration = chunk.get(count_key), chunk.get(duration_key)
+            if count and duration:
+                rate = count / (duration / 1e9)
+                histogram.observe(rate)
+                self.stats[count_key] = count
+                self.stats[count_key.replace("count", "rate")] = round(rate, 2)
+
+    def finish(self, error=None, cancelled=False):
+        if self._finished:
+            return
+        self._finished = True
+        ACTIVE_STREAMS.dec()
+        outcome = "error" if error else "cancelled" if cancelled else "cached" if self.cached else "ok"
+        fields = {"ttft_s": self.ttft and round(self.ttft, 4), **self.stats}
+        if error:
+            fields["error"] = str(error)
+        record_request(self.endpoint, outcome, self.started, **fields)
+
+
+def enable_timing_log(stream=None):
+    """Emit one JSON line per request on the ``ferret.timing`` logger."""
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    timing_log.addHandler(handler)
+    timing_log.setLevel(logging.INFO)
+    timing_log.propagate = False
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
@@ -0,0 +1,382 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
+from .config import CONFIG
+
+# Failures worth trying on another backend (404: model missing on that server)
+RETRY_STATUSES = (404, 408, 429, 500, 502, 503, 504)
+# Failures that take a backend out of rotation until a probe sees it again.
+# A slow prompt eval (read timeout) or a model missing there (404, which the
+# probe checks) says nothing about the server being down
+DOWN_STATUSES = (502, 503, 504)
+
+
+# --- SHARED OLLAMA HTTP CLIENT ---
+class OllamaClient:
+    """Keep-alive, pooled HTTP client shared by the terminal and web front ends.
+
+    Connection errors are retried with backoff; once a request has been sent
+    it is never replayed, so a generation is not started twice. Every chat
+    request carries ``keep_alive`` so the model stays loaded between turns.
+    """
+
+    def __init__(self, url=None, model=None, pool_size=None, connect_timeout=None,
+                 read_timeout=None, retries=None, backoff=None, keep_alive=None):
+        self.url = url or CONFIG["url"]
+        self.model = model or CONFIG["model"]
+        self.connect_timeout = connect_timeout or CONFIG["connect_timeout"]
+        self.read_timeout = read_timeout or CONFIG["read_timeout"]
+        self.keep_alive = CONFIG["keep_alive"] if keep_alive is None else keep_alive
+        self.warming = False
+
+        retry = Retry(
+            total=CONFIG["http_retries"] if retries is None else retries,
+            connect=CONFIG["http_retries"] if retries is None else retries,
+            read=0,
+            status=0,
+            backoff_factor=CONFIG["http_backoff"] if backoff is None else backoff,
+            allowed_methods=None,
+            raise_on_status=False,
+        )
+        pool_size = pool_size or CONFIG["http_pool_size"]
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def timeout(self, read_timeout=None):
+        return (self.connect_timeout, read_timeout or self.read_timeout)
+
+    def api_url(self, endpoint):
+        # ".../api/chat" -> ".../api/<endpoint>"
+        return f"{self.url.rsplit('/api/', 1)[0]}/api/{endpoint}"
+
+    def chat(self, messages, stream=True, options=None, read_timeout=None, sid=None, **extra):
+        # ``sid`` is a routing hint for BackendPool; a single server ignores it
+        payload = {"model": self.model, "messages": messages, "stream": stream, **extra}
+        if options:
+            payload["options"] = options
+        if self.keep_alive:
+            payload.setdefault("keep_alive", self.keep_alive)
+        response = self.session.post(self.url, json=payload, stream=stream, timeout=self.timeout(read_timeout))
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()  # hand the connection back to the pool
+            raise
+        return response
+
+    def embed(self, texts, model=None, read_timeout=None):
+        """Embedding vectors for ``texts``, one batched /api/embed call."""
+        payload = {"model": model or CONFIG["embed_model"], "input": list(texts)}
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
+        response = self.session.post(self.api_url("embed"), json=payload, timeout=self.timeout(read_timeout))
+        response.raise_for_status()
+        return response.json()["embeddings"]
+
+    # --- MODEL LIFECYCLE ---
+    def warm_up(self):
+        """Load the model (an empty chat does only that) and restart its keep_alive timer."""
+        self.warming = True
+        try:
+            self.chat([], stream=False, read_timeout=max(self.read_timeout, 600))
+        finally:
+            self.warming = False
+
+    def model_status(self, timeout=2):
+        """Readiness for health checks: is Ollama reachable and is our model in memory?"""
+        status = {"model": self.model, "reachable": False, "loaded": False, "warming": self.warming}
+        try:
+            # Plain request, no retry/backoff: a health check must answer quickly
+            response = requests.get(self.api_url("ps"), timeout=(self.connect_timeout, timeout))
+            response.raise_for_status()
+            models = response.json().get("models") or []
+        except (requests.RequestException, ValueError) as e:
+            status.update(status="unavailable", error=str(e))
+            return status
+
+        entry = next((m for m in models if self.model in (m.get("name"), m.get("model"))), None)
+        status.update(reachable=True, loaded=entry is not None)
+        if entry is not None:
+            status["expires_at"] = entry.get("expires_at")
+        status["status"] = "ready" if entry is not None else "loading" if self.warming else "cold"
+        return status
+
+    def close(self):
+        self.session.close()
+
+
+def start_warmup(client, keep_warm_hours=None, interval=None):
+    """Warm ``client``'s model on a daemon thread.
+
+    With ``keep_warm_hours`` (start, end) in local time, the warm-up is repeated
+    every ``interval`` seconds inside those hours, so an idle model is never
+    unloaded during the working day.
+    """
+    interval = interval or CONFIG["keep_warm_interval"]
+
+    def run():
+        first = True
+        while True:
+            hour = time.localtime().tm_hour
+            if first or (keep_warm_hours and keep_warm_hours[0] <= hour < keep_warm_hours[1]):
+                try:
+                    client.warm_up()
+                except requests.RequestException:
+                    pass  # Ollama down or still starting: the next request loads the model
+            if not keep_warm_hours:
+                return
+            first = False
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name="model-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+# --- MULTI-BACKEND ROUTING ---
+def retryable(error):
+    """True if a request failing with ``error`` may succeed on another backend."""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in RETRY_STATUSES
+    return isinstance(error, requests.RequestException)
+
+
+def backend_down(error):
+    """True if ``error`` means the backend itself is unreachable or broken."""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in DOWN_STATUSES
+    if not isinstance(error, requests.ConnectionError):
+        return False
+    # requests reports read timeouts as ConnectionError too (wrapped by the retry
+    # adapter, or raised while reading the stream): the server is up, just busy
+    cause = error.args[0] if error.args else None
+    return not isinstance(getattr(cause, "reason", cause), ReadTimeoutError)
+
+
+class Backend:
+    def __init__(self, client):
+        self.client = client
+        self.url = client.url
+        self.in_flight = 0
+        self.healthy = True
+        self.error = None
+
+
+class PooledStream:
+    """A streamed response from one backend; its slot is returned on ``close()``
+    or when ``iter_lines()`` is exhausted or closed."""
+
+    def __init__(self, pool, backend, response, lines, first):
+        self.pool = pool
+        self.backend = backend
+        self.response = response
+        self._lines = lines
+        self._first = first
+        self._closed = False
+        self._close_lock = threading.Lock()  # iter_lines may run on a reader thread
+
+    def iter_lines(self):
+        try:
+            if self._first is not None:
+                yield self._first
+            yield from self._lines
+        finally:
+            self.close()
+
+    def close(self):
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self.response.close()
+        self.pool.release(self.backend)
+
+
+class BackendPool:
+    """Spreads chat requests over several Ollama servers, like one OllamaClient.
+
+    A request goes to the healthy backend with the fewest requests in flight,
+    but a session stays on its previous backend (where its prompt prefix is
+    still cached) unless that one is more than ``max_skew`` requests busier.
+    A request that fails before its first token is retried on another backend.
+    Backends that refuse connections or answer 502/503/504 are taken out of
+    rotation until a probe sees them serving the model again.
+    """
+
+    def __init__(self, urls, model=None, probe_interval=None, max_skew=None, max_sessions=10000, **client_kwargs):
+        self.model = model or CONFIG["model"]
+        self.backends = [Backend(OllamaClient(url, self.model, **client_kwargs)) for url in urls]
+        self.url = self.backends[0].url
+        self.probe_interval = probe_interval or CONFIG["backend_probe_interval"]
+        self.max_skew = CONFIG["backend_max_skew"] if max_skew is None else max_skew
+        self.max_sessions = max_sessions
+        self._sticky = OrderedDict()  # sid -> backend, least recently used first
+        self._turn = 0
+        self._lock = threading.Lock()
+        if len(self.backends) > 1:
+            threading.Thread(target=self._probe_loop, name="backend-probes", daemon=True).start()
+
+    # --- ROUTING ---
+    def acquire(self, sid=None, exclude=()):
+        """Pick a backend and count the request against it; None if all are excluded."""
+        with self._lock:
+            candidates = [b for b in self.backends if b not in exclude]
+            if not candidates:
+                return None
+            # With every backend marked down, still try them: a probe may be stale
+            healthy = [b for b in candidates if b.healthy] or candidates
+            # Ties rotate, so idle backends share new sessions
+            self._turn += 1
+            backend = min(healthy, key=lambda b: (b.in_flight, (self.backends.index(b) - self._turn) % len(self.backends)))
+            if sid is not None:
+                sticky = self._sticky.get(sid)
+                if sticky in healthy and sticky.in_flight - backend.in_flight <= self.max_skew:
+                    backend = sticky
+                self._sticky[sid] = backend
+                self._sticky.move_to_end(sid)
+                if len(self._sticky) > self.max_sessions:
+                    self._sticky.popitem(last=False)
+            backend.in_flight += 1
+            return backend
+
+    def release(self, backend):
+        with self._lock:
+            backend.in_flight -= 1
+
+    def mark_failed(self, backend, error):
+        with self._lock:
+            backend.healthy = False
+            backend.error = str(error)
+
+    def chat(self, messages, stream=True, options=None, read_timeout=None, sid=None, **extra):
+        tried, error = [], None
+        while True:
+            backend = self.acquire(sid, tried)
+            if backend is None:
+                raise error
+            tried.append(backend)
+            response = None
+            try:
+                response = backend.client.chat(messages, stream, options, read_timeout, **extra)
+                if not stream:
+                    self.release(backend)
+                    return response
+                # Ollama's first NDJSON line is the first token: wait for it here,
+                # so a backend that dies during prompt evaluation is retried
+                lines = response.iter_lines()
+                first = next(lines, None)
+            except requests.RequestException as e:
+                if response is not None:
+                    response.close()
+                self.release(backend)
+                if not retryable(e):
+                    raise
+                if backend_down(e):
+                    self.mark_failed(backend, e)
+                error = e
+                continue
+            return PooledStream(self, backend, response, lines, first)
+
+    def embed(self, texts, model=None, read_timeout=None):
+        tried, error = [], None
+        while True:
+            backend = self.acquire(None, tried)
+            if backend is None:
+                raise error
+            tried.append(backend)
+            try:
+                return backend.client.embed(texts, model, read_timeout)
+            except requests.RequestException as e:
+                if not retryable(e):
+                    raise
+                if backend_down(e):
+                    self.mark_failed(backend, e)
+                error = e
+            finally:
+                self.release(backend)
+
+    # --- HEALTH ---
+    def probe(self, backend, timeout=3):
+        # Healthy = reachable and serving our model
+        try:
+            response = requests.get(backend.client.api_url("tags"), timeout=(backend.client.connect_timeout, timeout))
+            response.raise_for_status()
+            names = {m.get("name") for m in response.json().get("models") or []}
+            healthy, error = self.model in names, None if self.model in names else f"model {self.model} not found"
+        except (requests.RequestException, ValueError) as e:
+            healthy, error = False, str(e)
+        with self._lock:
+            backend.healthy, backend.error = healthy, error
+
+    def _probe_loop(self):
+        while True:
+            for backend in self.backends:
+                self.probe(backend)
+            time.sleep(self.probe_interval)
+
+    # --- MODEL LIFECYCLE (same interface as OllamaClient) ---
+    def warm_up(self):
+        with ThreadPoolExecutor(max_workers=len(self.backends)) as pool:
+            for backend, future in [(b, pool.submit(b.client.warm_up)) for b in self.backends]:
+                try:
+                    future.result()
+                except requests.RequestException as e:
+                    if backend_down(e):
+                        self.mark_failed(backend, e)
+
+    def model_status(self, timeout=2):
+        with ThreadPoolExecutor(max_workers=len(self.backends)) as pool:
+            statuses = list(pool.map(lambda b: b.client.model_status(timeout), self.backends))
+        for backend, status in zip(self.backends, statuses):
+            status.update(url=backend.url, healthy=backend.healthy, in_flight=backend.in_flight)
+            if backend.error:
+                status.setdefault("error", backend.error)
+
+        loaded = any(s["loaded"] for s in statuses)
+        if loaded:
+            overall = "ready"
+        elif any(s["warming"] for s in statuses):
+            overall = "loading"
+        else:
+            overall = "cold" if any(s["reachable"] for s in statuses) else "unavailable"
+        return {
+            "model": self.model,
+            "status": overall,
+            "loaded": loaded,
+            "reachable": any(s["reachable"] for s in statuses),
+            "warming": any(s["warming"] for s in statuses),
+            "backends": statuses,
+        }
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(url=None, model=None, **kwargs):
+    """One shared client per (url, model, options) for the whole process.
+
+    ``url`` may be a list of servers, which gives a BackendPool over them; with
+    no ``url``, CONFIG["backends"] (when set) is used the same way.
+    """
+    if isinstance(url, (list, tuple)):
+        urls = tuple(url)
+    elif url is None and CONFIG["backends"]:
+        urls = tuple(CONFIG["backends"])
+    else:
+        urls = url or CONFIG["url"]
+    key = (urls, model or CONFIG["model"], tuple(sorted(kwargs.items())))
+    with _clients_lock:
+        if key not in _clients:
+            pool = isinstance(urls, tuple)
+            _clients[key] = BackendPool(urls, key[1], **kwargs) if pool else OllamaClient(urls, key[1], **kwargs)
+        return _clients[key]
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
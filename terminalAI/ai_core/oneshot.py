@@ -0,0 +1,54 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+# -p / --file / piped stdin answer once and exit: this module only loads what
+# that needs, so a one-shot run never pays for the project indexing machinery
+from .config import CONFIG, PERSONAS
+from .ollama_client import get_client
+from .response_cache import ResponseCache, replay_lines
+from .stream_pipeline import Accumulator, iter_chunks, iter_content
+from .renderer import TerminalRenderer
+from .log_writer import LogWriter
+
+MAX_FILE_CHARS = 15000
+
+FILE_PROMPTS = {
+    "summary": "Provide a concise summary of this file.",
+    "explain": "Explain in detail what this file does, including architecture and logic.",
+    "refactor": (
+        "Refactor and improve this file. "
+        "Improve readability, structure, and performance. "
+        "Return the improved full code."
+    ),
+}
+
+
+def file_prompt(filename, content, mode="normal"):
+    prompt_prefix = FILE_PROMPTS.get(mode, f"Here is the content of file `{filename}`:")
+    return f"{prompt_prefix}\n\nFile name: `{filename}`\n\n```\n{content}\n```"
+
+
+def ask_once(user_input, persona=None, cache_id=None, stream=None):
+    """Answer a single prompt as plain text: no spinner, gutters or colors."""
+    CONFIG["persona"] = PERSONAS[persona or next(iter(PERSONAS))]
+    cache = ResponseCache()
+    cached = cache.get(cache_id) if cache_id else None
+    if cached is not None:
+        stream_lines = replay_lines(cached)
+    else:
+        messages = [{"role": "system", "content": CONFIG["persona"]}, {"role": "user", "content": user_input}]
+        response = get_client().chat(messages, options={"num_ctx": CONFIG["num_ctx"]}, sid="terminal")
+        stream_lines = response.iter_lines()
+
+    reply = Accumulator()
+    with TerminalRenderer(stream) as out:
+        for content in iter_content(iter_chunks(stream_lines)):
+            out.write(reply.add(content))
+        full_response = reply.text()
+        if not full_response.endswith("\n"):
+            out.write("\n")
+
+    if cache_id and cached is None and full_response:
+        cache.put(cache_id, full_response)
+    # Same log as the chat; the writer drains its queue at exit
+    LogWriter(CONFIG["log_dir"], "chat_TERM", separator="-" * 30).write(user_input, full_response)
+    return full_response
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
@@ -0,0 +1,206 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import re
+import sys
+import time
+import signal
+import textwrap
+import threading
+from .config import CONFIG, C
+from .utils import _get_terminal_width
+from .stream_pipeline import FenceSplitter
+
+PIPE_BUFFER_CHARS = 64 * 1024
+LANG_TAG_RE = re.compile(r"^[A-Za-z0-9_+#.-]*$")
+
+
+# --- FRAME-BATCHED TERMINAL OUTPUT ---
+class TerminalRenderer:
+    """Buffers streamed text and writes it once per frame instead of per character.
+
+    On a TTY a ticker thread flushes the buffer ``render_fps`` times a second.
+    When stdout is piped, output is written in large blocks. The old
+    character-by-character typing effect is kept behind ``typing_effect``.
+    """
+
+    def __init__(self, stream=None, fps=None, typing_effect=None):
+        self.stream = stream or sys.stdout
+        self.interval = 1.0 / (fps or CONFIG["render_fps"])
+        self.is_tty = self.stream.isatty()
+        self.typing_effect = (CONFIG["typing_effect"] if typing_effect is None else typing_effect) and self.is_tty
+        self._buffer = []
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ticker = None
+        if self.is_tty and not self.typing_effect:
+            self._ticker = threading.Thread(target=self._tick, name="render-ticker", daemon=True)
+            self._ticker.start()
+
+    def write(self, text):
+        if not text:
+            return
+        if self.typing_effect:
+            # Cosmetic mode: the pre-renderer behavior, opt-in only
+            for char in text:
+                self.stream.write(char)
+                self.stream.flush()
+                time.sleep(CONFIG["typing_speed"])
+            return
+        with self._lock:
+            self._buffer.append(text)
+            self._size += len(text)
+            if not self.is_tty and self._size >= PIPE_BUFFER_CHARS:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._buffer:
+            self.stream.write("".join(self._buffer))
+            self._buffer.clear()
+            self._size = 0
+        self.stream.flush()
+
+    def _tick(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                if self._buffer:
+                    self._flush_locked()
+
+    def close(self):
+        self._stop.set()
+        if self._ticker:
+            self._ticker.join()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- TERMINAL WIDTH (cached, refreshed on resize) ---
+_width = {"columns": None, "watching": False}
+
+
+def _on_resize(signum, frame):
+    _width["columns"] = None
+
+
+def refresh_terminal_width():
+    # Called once per response; SIGWINCH (where available) invalidates it mid-response
+    _width["columns"] = None
+    if (not _width["watching"] and hasattr(signal, "SIGWINCH")
+            and threading.current_thread() is threading.main_thread()):
+        signal.signal(signal.SIGWINCH, _on_resize)
+        _width["watching"] = True
+
+
+def terminal_width():
+    if _width["columns"] is None:
+        _width["columns"] = _get_terminal_width()
+    return _width["columns"]
+
+
+# --- STREAMING CODE BLOCKS ---
+class CodeBlockRenderer:
+    """Prints gutter-numbered code lines as soon as each newline arrives.
+
+    Each line is wrapped once, when it is complete. The raw text is kept for
+    ``/copy``, so the block never has to be rendered a second time.
+    """
+
+    GUTTER = f"{C['code']}│{C['reset']}"
+
+    def __init__(self, out):
+        self.out = out
+        self.lines = []
+        self.lang = None
+        self._partial = []
+        self._first = True
+
+    def feed(self, text):
+        while text:
+            newline = text.find("\n")
+            if newline == -1:
+                self._partial.append(text)
+                return
+            self._partial.append(text[:newline])
+            self._line("".join(self._partial))
+            self._partial = []
+            text = text[newline + 1:]
+
+    def _line(self, line):
+        if self._first:
+            self._first = False
+            # The rest of the opening fence line is the language tag (possibly empty)
+            if LANG_TAG_RE.match(line.strip()):
+                self.lang = line.strip()
+                return
+        self.lines.append(line)
+
+        width = max(terminal_width() - 7, 20)  # "│ 123 " + one spare column
+        if len(line) <= width:
+            wrapped = [line]
+        else:
+            wrapped = textwrap.wrap(line, width=width, drop_whitespace=False) or [line[:width]]
+        number = str(len(self.lines)).rjust(3)
+        for piece in wrapped:
+            self.out.write(f"{self.GUTTER} {number} {C['light_yellow']}{piece.ljust(width)}{C['reset']}\n")
+            number = "   "
+
+    def close(self):
+        """Flush the unterminated last line and return the raw code."""
+        if self._partial:
+            self._line("".join(self._partial))
+            self._partial = []
+        while self.lines and not self.lines[-1].strip():
+            self.lines.pop()
+        return "\n".join(self.lines)
+
+
+# --- ONE MODEL REPLY ---
+class ResponseRenderer:
+    """Renders one streamed reply: framed text plus line-by-line code blocks.
+
+    Raw code blocks are collected in ``code_blocks`` for ``/copy``.
+    """
+
+    def __init__(self, stream=None):
+        refresh_terminal_width()
+        self.out = TerminalRenderer(stream)
+        self.fences = FenceSplitter()
+        self.code_blocks = []
+        self._code = None
+
+    def feed(self, content):
+        for kind, text in self.fences.feed(content):
+            self._handle(kind, text)
+
+    def _handle(self, kind, text):
+        if kind == "open":
+            self._code = CodeBlockRenderer(self.out)
+        elif kind == "close":
+            code = self._code.close()
+            if code.strip():
+                self.code_blocks.append(code)
+            self._code = None
+        elif kind == "code":
+            self._code.feed(text)
+        else:
+            self.out.write(text)
+
+    def close(self):
+        for kind, text in self.fences.close():
+            self._handle(kind, text)
+        self.out.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
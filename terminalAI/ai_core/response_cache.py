@@ -0,0 +1,112 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import os
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from .config import CONFIG
+
+REPLAY_SPLIT_RE = re.compile(r"(```|\n)")
+
+
+def cache_key(model, mode, content):
+    digest = hashlib.sha256()
+    for part in (model, mode, content):
+        digest.update(part.encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def replay_lines(text):
+    # Re-emit a stored answer as Ollama NDJSON lines, splitting on newlines and
+    # fences so it goes through the same rendering path as a live stream.
+    for piece in REPLAY_SPLIT_RE.split(text):
+        if piece:
+            yield json.dumps({"message": {"role": "assistant", "content": piece}, "done": False}).encode("utf-8")
+    yield json.dumps({"message": {"role": "assistant", "content": ""}, "done": True}).encode("utf-8")
+
+
+# --- CONTENT-ADDRESSED RESPONSE CACHE ---
+class ResponseCache:
+    """In-memory LRU in front of a size-capped on-disk store of model answers."""
+
+    def __init__(self, cache_dir=None, max_entries=None, max_disk_bytes=None):
+        self.cache_dir = str(cache_dir or CONFIG["response_cache_dir"])
+        self.max_entries = max_entries or CONFIG["response_cache_entries"]
+        self.max_disk_bytes = max_disk_bytes or CONFIG["response_cache_bytes"]
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.txt")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path, None)  # keep disk eviction least-recently-used
+        except OSError:
+            return None
+        self._remember(key, text)
+        return text
+
+    def put(self, key, text):
+        self._remember(key, text)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += len(text.encode("utf-8"))
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _remember(self, key, text):
+        with self._lock:
+            self._memory[key] = text
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _entries(self):
+        try:
+            with os.scandir(self.cache_dir) as it:
+                return [e for e in it if e.name.endswith(".txt") and e.is_file()]
+        except OSError:
+            return []
+
+    def _scan_disk_bytes(self):
+        return sum(e.stat().st_size for e in self._entries())
+
+    def _evict_disk(self):
+        # Oldest first, down to 90% of the cap so we don't evict on every put
+        entries = sorted(self._entries(), key=lambda e: e.stat().st_mtime)
+        total = sum(e.stat().st_size for e in entries)
+        target = self.max_disk_bytes * 0.9
+        for entry in entries:
+            if total <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+            except OSError:
+                continue
+        self._disk_bytes = total
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
@@ -0,0 +1,145 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import re
+import math
+import heapq
+from collections import Counter
+from functools import lru_cache
+
+WORD_RE = re.compile(r"[A-Za-z0-9_]+")
+CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+SYMBOL_BOOST = 5
+TRACEBACK_FILE_BOOST = 20
+RAISE_BOOST = 3
+
+
+# --- TOKENIZER ---
+@lru_cache(maxsize=65536)
+def _word_tokens(word):
+    # Identifiers are kept whole and also split on snake_case / camelCase,
+    # so "login" still matches "login_user" and "loginUser".
+    lower = word.lower()
+    parts = [p.lower() for piece in word.split("_") for p in CAMEL_RE.findall(piece)]
+    return (lower, *parts) if len(parts) > 1 else (lower,)
+
+
+def tokenize(text):
+    tokens = []
+    for word in WORD_RE.findall(text):
+        tokens.extend(_word_tokens(word))
+    return tokens
+
+
+# --- PER-FILE ENTRY LISTS ---
+class FileEntries:
+    """Entries grouped by file, iterated in the order files were added.
+
+    Replacing or dropping a file touches only that file's entries, so a watched
+    save costs the same in a big project as in a small one.
+    """
+
+    def __init__(self):
+        self.by_path = {}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for entries in self.by_path.values():
+            yield from entries
+
+    def set(self, path, entries):
+        self.remove_path(path)
+        entries = list(entries)
+        if entries:
+            self.by_path[path] = entries
+            self.count += len(entries)
+
+    def remove_path(self, path):
+        self.count -= len(self.by_path.pop(path, ()))
+
+
+# --- BM25 INVERTED INDEX ---
+class BM25Index:
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.docs = {}
+        self.doc_len = {}
+        self.doc_terms = {}
+        self.postings = {}
+        self.name_postings = {}
+        self.by_path = {}
+        self.total_len = 0
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, path, block, name=None, lines=None):
+        doc_id = self._next_id
+        self._next_id += 1
+
+        tf = Counter(tokenize(block))
+        self.docs[doc_id] = (path, block, name, lines)
+        self.doc_len[doc_id] = sum(tf.values())
+        self.doc_terms[doc_id] = list(tf)
+        self.total_len += self.doc_len[doc_id]
+        for term, count in tf.items():
+            self.postings.setdefault(term, {})[doc_id] = count
+        if name:
+            for term in set(tokenize(name)):
+                self.name_postings.setdefault(term, set()).add(doc_id)
+        self.by_path.setdefault(path, []).append(doc_id)
+        return doc_id
+
+    def remove_path(self, path):
+        for doc_id in self.by_path.pop(path, []):
+            _, _, name, _ = self.docs.pop(doc_id)
+            self.total_len -= self.doc_len.pop(doc_id)
+            for term in self.doc_terms.pop(doc_id):
+                posting = self.postings[term]
+                del posting[doc_id]
+                if not posting:
+                    del self.postings[term]
+            if name:
+                for term in set(tokenize(name)):
+                    ids = self.name_postings[term]
+                    ids.discard(doc_id)
+                    if not ids:
+                        del self.name_postings[term]
+
+    def clear(self):
+        self.__init__(self.k1, self.b)
+
+    def search(self, question, k=64, traceback_file=None):
+        if not self.docs:
+            return []
+        n_docs = len(self.docs)
+        avg_len = (self.total_len / n_docs) or 1.0
+        terms = set(tokenize(question))
+        scores = {}
+
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting:
+                idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                for doc_id, tf in posting.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.doc_len[doc_id] / avg_len)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+            for doc_id in self.name_postings.get(term, ()):
+                scores[doc_id] = scores.get(doc_id, 0.0) + SYMBOL_BOOST
+
+        if "traceback" in question.lower():
+            for doc_id, tf in self.postings.get("raise", {}).items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + tf * RAISE_BOOST
+        if traceback_file:
+            for path, doc_ids in self.by_path.items():
+                if traceback_file in path:
+                    for doc_id in doc_ids:
+                        scores[doc_id] = scores.get(doc_id, 0.0) + TRACEBACK_FILE_BOOST
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(round(score, 2), *self.docs[doc_id]) for doc_id, score in top if score > 0]
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
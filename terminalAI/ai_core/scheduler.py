@@ -0,0 +1,156 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import time
+import itertools
+import threading
+from collections import OrderedDict, deque
+
+# Lower runs first
+PRIORITY_CHAT = 0
+PRIORITY_LOG = 1
+
+
+class SchedulerFull(Exception):
+    """Raised by ``FairScheduler.submit`` when the wait queue is at capacity."""
+
+
+# --- TICKETS ---
+class Ticket:
+    def __init__(self, scheduler, sid, priority, notify=None):
+        self.scheduler = scheduler
+        self.sid = sid
+        self.priority = priority
+        self.notify = notify  # called (from any thread) when a slot is granted
+        self.seq = 0
+        self.enqueued = time.monotonic()
+        self.waited = None
+        self.granted = threading.Event()
+        self.done = False
+
+    def wait(self, timeout=None):
+        return self.granted.wait(timeout)
+
+    def position(self):
+        return self.scheduler.position(self)
+
+    def release(self):
+        self.scheduler.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+# --- FAIR SCHEDULER ---
+class FairScheduler:
+    """Caps concurrent model generations and queues the rest fairly.
+
+    Waiting requests are grouped by priority class, then by session; within a
+    class sessions take turns, so one user with many tabs can't starve the
+    others. A request that has waited ``aging`` seconds is served as if it had
+    the top priority, so long /log analyses still run under constant chat load.
+    """
+
+    def __init__(self, max_active=2, max_queued=32, aging=30.0):
+        self.max_active = max_active
+        self.max_queued = max_queued
+        self.aging = aging
+        self.active = 0
+        self._queued = 0
+        self._queues = {}  # priority -> OrderedDict(sid -> deque of tickets)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def submit(self, sid, priority=PRIORITY_CHAT, notify=None):
+        """Queue a request and return its ticket, granted at once if a slot is free."""
+        ticket = Ticket(self, sid, priority, notify)
+        with self._lock:
+            if self.active >= self.max_active and self._queued >= self.max_queued:
+                raise SchedulerFull(f"{self._queued} requests already waiting")
+            ticket.seq = next(self._seq)
+            sessions = self._queues.setdefault(priority, OrderedDict())
+            sessions.setdefault(sid, deque()).append(ticket)
+            self._queued += 1
+            granted = self._dispatch_locked()
+        self._notify(granted)
+        return ticket
+
+    def release(self, ticket):
+        """Free the ticket's slot, or withdraw it from the queue. Idempotent."""
+        with self._lock:
+            if ticket.done:
+                return
+            ticket.done = True
+            if ticket.granted.is_set():
+                self.active -= 1
+            else:
+                self._remove_locked(ticket)
+            granted = self._dispatch_locked()
+        self._notify(granted)
+
+    def position(self, ticket):
+        """1-based place in line if every session keeps taking turns; 0 once granted."""
+        with self._lock:
+            if ticket.granted.is_set() or ticket.done:
+                return 0
+            ahead = sum(self._waiting_locked(p) for p in self._queues if p < ticket.priority)
+            sessions = self._queues.get(ticket.priority, {})
+            own = sessions.get(ticket.sid, ())
+            rank = own.index(ticket) if ticket in own else 0
+            before = True
+            for sid, tickets in sessions.items():
+                if sid == ticket.sid:
+                    before = False
+                    continue
+                ahead += min(len(tickets), rank + (1 if before else 0))
+            return ahead + rank + 1
+
+    def stats(self):
+        with self._lock:
+            return {"active": self.active, "queued": self._queued}
+
+    def _waiting_locked(self, priority):
+        return sum(len(tickets) for tickets in self._queues[priority].values())
+
+    def _remove_locked(self, ticket):
+        sessions = self._queues.get(ticket.priority, {})
+        tickets = sessions.get(ticket.sid)
+        if tickets and ticket in tickets:
+            tickets.remove(ticket)
+            self._queued -= 1
+            if not tickets:
+                del sessions[ticket.sid]
+
+    def _dispatch_locked(self):
+        granted = []
+        now = time.monotonic()
+        while self.active < self.max_active and self._queued:
+            # Head of each class is its next session in turn
+            heads = [(p, next(iter(sessions))) for p, sessions in self._queues.items() if sessions]
+            priority, sid = min(heads, key=lambda head: self._rank(head, now))
+            sessions = self._queues[priority]
+            ticket = sessions[sid].popleft()
+            if sessions[sid]:
+                sessions.move_to_end(sid)
+            else:
+                del sessions[sid]
+            self._queued -= 1
+            self.active += 1
+            ticket.waited = now - ticket.enqueued
+            ticket.granted.set()
+            granted.append(ticket)
+        return granted
+
+    def _rank(self, head, now):
+        priority, sid = head
+        ticket = self._queues[priority][sid][0]
+        effective = PRIORITY_CHAT if now - ticket.enqueued >= self.aging else priority
+        return effective, ticket.seq
+
+    def _notify(self, granted):
+        # Outside the lock: callbacks may hop to an event loop
+        for ticket in granted:
+            if ticket.notify is not None:
+                ticket.notify()
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
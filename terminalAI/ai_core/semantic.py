@@ -0,0 +1,195 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import os
+import hashlib
+from importlib.util import find_spec
+from .config import CONFIG
+from .index_cache import content_digest
+
+VECTOR_CACHE_VERSION = 1
+RRF_K = 60
+
+
+def numpy_available():
+    # numpy is optional and slow to import: only load it once semantic search is used
+    return find_spec("numpy") is not None
+
+
+def _unit_rows(matrix):
+    import numpy as np
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+# --- ON-DISK VECTOR CACHE ---
+class VectorCache:
+    """Block embeddings for one project and embedding model, keyed by block hash.
+
+    Stored as a float32 .npz matrix beside the project's index cache, so an
+    unchanged block is never sent to the embedding model twice.
+    """
+
+    def __init__(self, root, model=None, cache_dir=None):
+        self.root = os.path.realpath(root)
+        self.model = model or CONFIG["embed_model"]
+        self.cache_dir = cache_dir or CONFIG["index_cache_dir"]
+        key = hashlib.sha1(self.root.encode("utf-8")).hexdigest()[:16]
+        model_key = hashlib.sha1(self.model.encode("utf-8")).hexdigest()[:8]
+        self.path = os.path.join(self.cache_dir, f"project_{key}_{model_key}.vectors.npz")
+        self.vectors = {}  # digest -> unit-length float32 row
+        self.dirty = False
+
+    def load(self):
+        import numpy as np
+
+        try:
+            with np.load(self.path) as data:
+                if int(data["version"]) != VECTOR_CACHE_VERSION or str(data["model"]) != self.model:
+                    return
+                hashes, matrix = data["hashes"], data["matrix"]
+        except (OSError, ValueError, KeyError):
+            return
+        self.vectors = dict(zip(hashes.tolist(), matrix))
+
+    def save(self):
+        import numpy as np
+
+        if not self.dirty:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        hashes = list(self.vectors)
+        matrix = np.stack([self.vectors[h] for h in hashes]) if hashes else np.zeros((0, 0), np.float32)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, version=VECTOR_CACHE_VERSION, model=self.model, hashes=np.array(hashes, dtype="U40"),
+                     matrix=matrix)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def missing(self, digests):
+        return [d for d in dict.fromkeys(digests) if d not in self.vectors]
+
+    def store(self, digests, vectors):
+        import numpy as np
+
+        rows = _unit_rows(np.asarray(vectors, dtype=np.float32))
+        for digest, row in zip(digests, rows):
+            self.vectors[digest] = row
+        self.dirty = True
+
+    def prune(self, seen):
+        removed = [d for d in self.vectors if d not in seen]
+        for digest in removed:
+            del self.vectors[digest]
+        if removed:
+            self.dirty = True
+        return removed
+
+
+def embed_missing(client, cache, blocks, batch_size=None, progress=None):
+    """Embed the blocks ``cache`` has no vector for, ``batch_size`` per request.
+
+    ``blocks`` are project_blocks tuples. Returns how many were embedded.
+    """
+    batch_size = batch_size or CONFIG["embed_batch_size"]
+    texts = {content_digest(block): block for _, block, _, _ in blocks}
+    todo = cache.missing(texts)
+    for start in range(0, len(todo), batch_size):
+        batch = todo[start:start + batch_size]
+        cache.store(batch, client.embed([texts[d] for d in batch], cache.model))
+        if progress:
+            progress(min(start + batch_size, len(todo)), len(todo))
+    return len(todo)
+
+
+# --- COSINE SEARCH ---
+class SemanticIndex:
+    """Cosine search over block embeddings.
+
+    New rows go into spare matrix capacity and a removed file's rows are only
+    zeroed, so a watched save costs its own blocks, not a copy of the matrix.
+    Dead rows are compacted away once they outnumber the live ones.
+    """
+
+    def __init__(self, blocks, cache):
+        import numpy as np
+
+        # Rows line up with self.docs (None once removed); vectors are unit
+        # length, so a dot product is the cosine
+        self.docs = []
+        self.hashes = []
+        self.rows = {}  # path -> its row numbers
+        self.dead = 0
+        self.matrix = np.zeros((0, 0), np.float32)
+        self.add(blocks, cache)
+
+    def __len__(self):
+        return len(self.docs) - self.dead
+
+    def add(self, blocks, cache):
+        import numpy as np
+
+        blocks = list(blocks)
+        if not blocks:
+            return
+        hashes = [content_digest(block) for _, block, _, _ in blocks]
+        rows = np.stack([cache.vectors[digest] for digest in hashes])
+        start, end = len(self.docs), len(self.docs) + len(rows)
+        if end > len(self.matrix):
+            grown = np.zeros((max(end, 2 * len(self.matrix)), rows.shape[1]), np.float32)
+            if start:
+                grown[:start] = self.matrix[:start]
+            self.matrix = grown
+        self.matrix[start:end] = rows
+        for row, doc in enumerate(blocks, start):
+            self.rows.setdefault(doc[0], []).append(row)
+        self.docs.extend(blocks)
+        self.hashes.extend(hashes)
+
+    def remove_path(self, path):
+        rows = self.rows.pop(path, None)
+        if not rows:
+            return
+        for row in rows:
+            self.docs[row] = self.hashes[row] = None
+        self.matrix[rows] = 0.0  # scores 0: never returned by search()
+        self.dead += len(rows)
+        if self.dead > len(self):
+            self._compact()
+
+    def _compact(self):
+        keep = [i for i, doc in enumerate(self.docs) if doc is not None]
+        self.matrix = self.matrix[keep]
+        self.docs = [self.docs[i] for i in keep]
+        self.hashes = [self.hashes[i] for i in keep]
+        self.rows = {}
+        for row, doc in enumerate(self.docs):
+            self.rows.setdefault(doc[0], []).append(row)
+        self.dead = 0
+
+    def search(self, query_vector, k=64):
+        import numpy as np
+
+        if not len(self):
+            return []
+        query = _unit_rows(np.asarray([query_vector], dtype=np.float32))[0]
+        scores = self.matrix[:len(self.docs)] @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(round(float(scores[i]), 3), *self.docs[i]) for i in top if scores[i] > 0]
+
+
+def fuse(*rankings, k=64):
+    """Reciprocal rank fusion of search results: only ranks count, so cosine
+    and BM25 scores never need to be put on the same scale."""
+    fused, docs = {}, {}
+    for ranking in rankings:
+        for rank, (_, path, block, name, lines) in enumerate(ranking):
+            key = (path, tuple(lines))
+            fused[key] = fused.get(key, 0.0) + 1.0 / (RRF_K + rank + 1)
+            docs[key] = (path, block, name, lines)
+    top = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:k]
+    return [(round(score, 4), *docs[key]) for key, score in top]
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
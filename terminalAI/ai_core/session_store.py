@@ -0,0 +1,215 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+
+
+# --- IN-MEMORY LRU + TTL BACKEND ---
+class MemorySessionStore:
+    """Process-local sessions, evicted by idle time, count and total size."""
+
+    def __init__(self, system_message, max_sessions=1000, ttl=3600, max_bytes=64 * 1024 * 1024):
+        self.system_message = system_message
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sessions = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def ensure(self, sid):
+        now = time.time()
+        with self._lock:
+            entry = self._sessions.get(sid)
+            if entry is None:
+                message = dict(self.system_message)
+                entry = {"messages": [message], "summary": "", "upto": 1, "bytes": len(message["content"])}
+                self._sessions[sid] = entry
+                self._bytes += entry["bytes"]
+            entry["seen"] = now
+            self._sessions.move_to_end(sid)
+            self._evict(now, keep=sid)
+
+    def _evict(self, now, keep=None):
+        # Least recently used sessions sit at the front of the OrderedDict
+        while self._sessions:
+            sid, entry = next(iter(self._sessions.items()))
+            if sid == keep:
+                break
+            expired = now - entry["seen"] > self.ttl
+            if not (expired or len(self._sessions) > self.max_sessions or self._bytes > self.max_bytes):
+                break
+            del self._sessions[sid]
+            self._bytes -= entry["bytes"]
+
+    def _entry(self, sid):
+        entry = self._sessions.get(sid)
+        if entry is None:
+            self.ensure(sid)
+            entry = self._sessions[sid]
+        return entry
+
+    def append(self, sid, message):
+        with self._lock:
+            entry = self._sessions.get(sid)
+            if entry is None:
+                return
+            entry["messages"].append(message)
+            entry["bytes"] += len(message["content"])
+            self._bytes += len(message["content"])
+
+    def conversation(self, sid):
+        return self._entry(sid)["messages"]
+
+    def load_summary(self, sid):
+        entry = self._entry(sid)
+        return entry["summary"], entry["upto"]
+
+    def save_summary(self, sid, summary, upto):
+        with self._lock:
+            entry = self._sessions.get(sid)
+            if entry is not None and upto > entry["upto"]:
+                entry["summary"], entry["upto"] = summary, upto
+
+
+# --- SQLITE BACKEND (shared between worker processes) ---
+class SQLiteConversation(Sequence):
+    """Read-only, list-like view of one session's messages, queried by range."""
+
+    def __init__(self, store, sid):
+        self.store = store
+        self.sid = sid
+
+    def __len__(self):
+        row = self.store._db().execute(
+            "SELECT COALESCE(MAX(seq), -1) + 1 FROM messages WHERE sid = ?", (self.sid,)
+        ).fetchone()
+        return row[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            rows = self.store._db().execute(
+                "SELECT role, content FROM messages WHERE sid = ? AND seq >= ? AND seq < ? ORDER BY seq",
+                (self.sid, start, stop),
+            ).fetchall()
+            return [{"role": role, "content": content} for role, content in rows]
+        if index < 0:
+            index += len(self)
+        row = self.store._db().execute(
+            "SELECT role, content FROM messages WHERE sid = ? AND seq = ?", (self.sid, index)
+        ).fetchone()
+        if row is None:
+            raise IndexError(index)
+        return {"role": row[0], "content": row[1]}
+
+
+class SQLiteSessionStore:
+    """Sessions in a local SQLite file (WAL), safe to share between processes."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            sid TEXT PRIMARY KEY,
+            summary TEXT NOT NULL DEFAULT '',
+            summarized_upto INTEGER NOT NULL DEFAULT 1,
+            last_seen REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS messages (
+            sid TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            role TEXT NOT NULL,
+            content TEXT NOT NULL,
+            PRIMARY KEY (sid, seq)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS sessions_last_seen ON sessions (last_seen);
+    """
+    PURGE_EVERY = 200
+
+    def __init__(self, path, system_message, ttl=7 * 24 * 3600):
+        self.path = str(path)
+        self.system_message = system_message
+        self.ttl = ttl
+        self._local = threading.local()
+        self._calls = 0
+        with self._db() as db:
+            db.executescript(self.SCHEMA)
+
+    def _db(self):
+        # sqlite3 connections can't be shared across threads: one per thread
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def __len__(self):
+        return self._db().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def ensure(self, sid):
+        now = time.time()
+        with self._db() as db:
+            created = db.execute(
+                "INSERT OR IGNORE INTO sessions (sid, last_seen) VALUES (?, ?)", (sid, now)
+            ).rowcount
+            if created:
+                db.execute(
+                    "INSERT OR IGNORE INTO messages (sid, seq, role, content) VALUES (?, 0, ?, ?)",
+                    (sid, self.system_message["role"], self.system_message["content"]),
+                )
+            else:
+                db.execute("UPDATE sessions SET last_seen = ? WHERE sid = ?", (now, sid))
+
+        self._calls += 1
+        if self._calls % self.PURGE_EVERY == 0:
+            self.purge(now)
+
+    def purge(self, now=None):
+        cutoff = (now or time.time()) - self.ttl
+        with self._db() as db:
+            db.execute(
+                "DELETE FROM messages WHERE sid IN (SELECT sid FROM sessions WHERE last_seen < ?)", (cutoff,)
+            )
+            db.execute("DELETE FROM sessions WHERE last_seen < ?", (cutoff,))
+
+    def append(self, sid, message):
+        # Single statement, so concurrent writers can't pick the same seq
+        with self._db() as db:
+            db.execute(
+                "INSERT INTO messages (sid, seq, role, content) "
+                "SELECT ?, COALESCE(MAX(seq), -1) + 1, ?, ? FROM messages WHERE sid = ?",
+                (sid, message["role"], message["content"], sid),
+            )
+
+    def conversation(self, sid):
+        return SQLiteConversation(self, sid)
+
+    def load_summary(self, sid):
+        row = self._db().execute(
+            "SELECT summary, summarized_upto FROM sessions WHERE sid = ?", (sid,)
+        ).fetchone()
+        return row if row else ("", 1)
+
+    def save_summary(self, sid, summary, upto):
+        with self._db() as db:
+            db.execute(
+                "UPDATE sessions SET summary = ?, summarized_upto = ? WHERE sid = ? AND summarized_upto < ?",
+                (summary, upto, sid, upto),
+            )
+
+
+def open_session_store(backend, system_message, **kwargs):
+    if backend == "sqlite":
+        return SQLiteSessionStore(kwargs.pop("path"), system_message, **kwargs)
+    if backend == "memory":
+        return MemorySessionStore(system_message, **kwargs)
+    raise ValueError(f"Unknown session backend: {backend}")
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
@@ -0,0 +1,174 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import re
+import json
+import time
+
+FENCE = "```"
+# Markdown image: ![alt](url) -> alt
+IMAGE_RE = re.compile(r"!\[([^\]\n]*)\]\([^)\n]*\)")
+MAX_PENDING_IMAGE = 512
+
+
+# --- NDJSON DECODING ---
+def decode_line(line):
+    """One Ollama NDJSON line (bytes or str) -> dict, or None if blank/invalid."""
+    if not line:
+        return None
+    try:
+        chunk = json.loads(line)
+    except ValueError:
+        return None
+    return chunk if isinstance(chunk, dict) else None
+
+
+def chunk_content(chunk):
+    return (chunk.get("message") or {}).get("content") or ""
+
+
+def iter_chunks(lines):
+    for line in lines:
+        chunk = decode_line(line)
+        if chunk is not None:
+            yield chunk
+
+
+def iter_content(chunks):
+    for chunk in chunks:
+        content = chunk_content(chunk)
+        if content:
+            yield content
+
+
+# --- SANITIZER ---
+class Sanitizer:
+    """Strips markdown images from streamed text, even when split across chunks."""
+
+    def __init__(self):
+        self._pending = ""
+
+    def feed(self, text):
+        if self._pending:
+            text, self._pending = self._pending + text, ""
+        elif "!" not in text:
+            return text
+
+        # Hold back an image that may still be arriving ("![alt](ur" or a trailing "!")
+        start = text.rfind("![")
+        if (start != -1 and not IMAGE_RE.match(text, start)
+                and "\n" not in text[start:] and len(text) - start < MAX_PENDING_IMAGE):
+            text, self._pending = text[:start], text[start:]
+        elif text.endswith("!"):
+            text, self._pending = text[:-1], "!"
+        return IMAGE_RE.sub(r"\1", text)
+
+    def close(self):
+        rest, self._pending = self._pending, ""
+        return rest
+
+
+# --- FENCE STATE MACHINE ---
+class FenceSplitter:
+    """Splits streamed markdown into ``("text"|"code", str)`` pieces and
+    ``("open"|"close", "")`` events at ``` fences.
+
+    Trailing backticks are held back until the next chunk, so a fence split
+    across chunks ("``" + "`python") is still seen as one fence.
+    """
+
+    def __init__(self):
+        self.in_code = False
+        self._pending = ""
+
+    def feed(self, text):
+        if self._pending:
+            text, self._pending = self._pending + text, ""
+        events = []
+        while True:
+            fence = text.find(FENCE)
+            if fence == -1:
+                break
+            if fence:
+                events.append(("code" if self.in_code else "text", text[:fence]))
+            self.in_code = not self.in_code
+            events.append(("open" if self.in_code else "close", ""))
+            text = text[fence + len(FENCE):]
+
+        held = len(text) - len(text.rstrip("`"))
+        if held:
+            text, self._pending = text[:-held], text[-held:]
+        if text:
+            events.append(("code" if self.in_code else "text", text))
+        return events
+
+    def close(self):
+        events = []
+        if self._pending:
+            events.append(("code" if self.in_code else "text", self._pending))
+            self._pending = ""
+        if self.in_code:
+            self.in_code = False
+            events.append(("close", ""))
+        return events
+
+
+# --- SSE COALESCING ---
+class Coalescer:
+    """Batches streamed pieces into fewer, larger events.
+
+    The first piece is released at once (time-to-first-token); after that,
+    pieces are held until ``interval`` seconds have passed since the last
+    release or ``max_bytes`` are pending.
+    """
+
+    def __init__(self, interval=0.05, max_bytes=512, clock=time.monotonic):
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._parts = []
+        self._size = 0
+        self._last = None
+
+    def feed(self, text):
+        if text:
+            self._parts.append(text)
+            self._size += len(text)
+        if not self._parts:
+            return ""
+        if self._last is None or self._size >= self.max_bytes or self.clock() - self._last >= self.interval:
+            return self.flush()
+        return ""
+
+    def due_in(self):
+        """Seconds until pending text should be released (None if nothing is pending)."""
+        if not self._parts:
+            return None
+        if self._last is None:
+            return 0
+        return max(self.interval - (self.clock() - self._last), 0)
+
+    def flush(self):
+        text = "".join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        self._last = self.clock()
+        return text
+
+
+# --- ACCUMULATOR ---
+class Accumulator:
+    """Collects streamed pieces in a list and joins them once."""
+
+    def __init__(self):
+        self.parts = []
+
+    def add(self, text):
+        if text:
+            self.parts.append(text)
+        return text
+
+    def __bool__(self):
+        return bool(self.parts)
+
+    def text(self):
+        return "".join(self.parts)
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
@@ -33,6 +33,16 @@ def _typing_indicator(stop_event):
         i += 1
     sys.stdout.write("\r" + " " * 30 + "\r")
 
+def _print_progress(done, total, started, label="files", stream=None):
+    ratio = done / total if total else 1.0
+    bar_length = 24
+    filled = int(bar_length * ratio)
+    rate = done / max(time.time() - started, 1e-6)
+    bar = "█" * filled + "░" * (bar_length - filled)
+    stream = stream or sys.stdout
+    stream.write(f"\r{C['info']}[{bar}]{C['reset']} {done}/{total} {label} ({rate:.0f}/s)")
+    stream.flush()
+
 def _get_terminal_width(default=80):
     try:
         return shutil.get_terminal_size().columns
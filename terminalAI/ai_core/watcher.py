@@ -0,0 +1,248 @@
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
+import os
+import time
+import errno
+import select
+import struct
+import threading
+from .config import CONFIG, C
+
+# inotify through ctypes (Linux); everywhere else the tree is polled
+try:
+    import ctypes
+    import ctypes.util
+
+    _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    _libc.inotify_init1, _libc.inotify_add_watch, _libc.inotify_rm_watch
+except (ImportError, OSError, AttributeError):
+    _libc = None
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+WHOLE_TREE = "."
+
+
+# --- CHANGE SOURCES ---
+class InotifySource:
+    def __init__(self, root, wanted):
+        self.root = root
+        self.wanted = wanted
+        self.dirs = {}  # watch descriptor -> folder relative to root
+        self.fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        try:
+            self._watch_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, top):
+        for dirpath, _, _ in os.walk(top):
+            wd = _libc.inotify_add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err in (errno.ENOENT, errno.ENOTDIR):
+                    continue  # gone again before we got to it
+                # ENOSPC: fs.inotify.max_user_watches reached
+                raise OSError(err, f"inotify_add_watch: {os.strerror(err)}")
+            self.dirs[wd] = os.path.relpath(dirpath, self.root)
+
+    def _unwatch_tree(self, rel):
+        prefix = rel + os.sep
+        for wd, folder in list(self.dirs.items()):
+            if folder == rel or folder.startswith(prefix):
+                _libc.inotify_rm_watch(self.fd, wd)
+                del self.dirs[wd]
+
+    def changes(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed, offset = set(), 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].split(b"\0", 1)[0]
+            offset += EVENT_HEADER.size + length
+            if mask & IN_Q_OVERFLOW:
+                changed.add(WHOLE_TREE)  # events were dropped: rescan
+                continue
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            folder = self.dirs.get(wd)
+            if folder is None or not name:
+                continue
+            rel = os.path.normpath(os.path.join(folder, os.fsdecode(name)))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._watch_tree(os.path.join(self.root, rel))
+                elif mask & IN_MOVED_FROM:
+                    self._unwatch_tree(rel)
+                changed.add(rel)
+            elif self.wanted(rel):
+                changed.add(rel)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingSource:
+    """Rescans the tree for (mtime, size) changes.
+
+    The wait between scans grows with the time a scan takes, so a big tree
+    costs at most ``load`` of the time instead of being walked every second.
+    """
+
+    def __init__(self, root, wanted, interval=None, load=None):
+        self.root = root
+        self.wanted = wanted
+        self.min_interval = interval or CONFIG["watch_poll_interval"]
+        self.load = load or CONFIG["watch_poll_load"]
+        self.interval = self.min_interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        # rel -> (mtime, size), the same test the index cache uses; scandir's
+        # stat is free on Windows, where polling is the normal case
+        started = time.monotonic()
+        snapshot, folders = {}, [self.root]
+        while folders:
+            folder = folders.pop()
+            try:
+                entries = list(os.scandir(folder))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        folders.append(entry.path)
+                        continue
+                    rel = os.path.relpath(entry.path, self.root)
+                    if self.wanted(rel):
+                        st = entry.stat()
+                        snapshot[rel] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+        self.scanned = time.monotonic()
+        self.interval = max(self.min_interval, (self.scanned - started) / self.load)
+        return snapshot
+
+    def changes(self, timeout):
+        time.sleep(max(0.0, min(timeout, self.scanned + self.interval - time.monotonic())))
+        if time.monotonic() - self.scanned < self.interval:
+            return set()
+        snapshot = self._scan()
+        old, self.snapshot = self.snapshot, snapshot
+        return {rel for rel in old.keys() | snapshot.keys() if old.get(rel) != snapshot.get(rel)}
+
+    def close(self):
+        pass
+
+
+# --- PROJECT WATCHER ---
+class ProjectWatcher:
+    """Reports changed project files once saves have been quiet for ``debounce`` seconds.
+
+    ``on_change`` gets a set of paths relative to ``root``: files, folders that
+    appeared or went away, or "." when the whole tree must be rescanned. It
+    runs on the watcher thread, or on the caller's thread from ``flush()``.
+    """
+
+    def __init__(self, root, on_change, wanted=None, debounce=None, poll_interval=None):
+        self.root = root
+        self.on_change = on_change
+        self.wanted = wanted or (lambda rel: True)
+        self.debounce = CONFIG["watch_debounce"] if debounce is None else debounce
+        self.poll_interval = poll_interval
+        self.source = None
+        self._pending = set()
+        self._last_event = 0.0
+        self._lock = threading.Lock()
+        self._apply_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def kind(self):
+        return "inotify" if isinstance(self.source, InotifySource) else "polling"
+
+    def start(self):
+        self.source = self._open_source()
+        self._thread = threading.Thread(target=self._run, name="project-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def _open_source(self):
+        if _libc is not None:
+            try:
+                return InotifySource(self.root, self.wanted)
+            except OSError:
+                pass
+        return PollingSource(self.root, self.wanted, self.poll_interval)
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                with self._lock:
+                    quiet = time.monotonic() - self._last_event
+                    due = bool(self._pending) and quiet >= self.debounce
+                if due:
+                    try:
+                        self.flush()
+                    except Exception as e:
+                        # A failed update must not end live reindexing: the next save retries
+                        print(f"{C['yellow']}Could not apply project changes: {e}{C['reset']}")
+                    continue
+                timeout = self.debounce - quiet if self._pending else 1.0
+                try:
+                    changed = self.source.changes(max(timeout, 0.01))
+                except OSError:
+                    # Out of inotify watches (or the fd broke): poll from now on
+                    self.source.close()
+                    self.source = PollingSource(self.root, self.wanted, self.poll_interval)
+                    changed = {WHOLE_TREE}
+                if changed:
+                    with self._lock:
+                        self._pending |= changed
+                        self._last_event = time.monotonic()
+        finally:
+            self.source.close()
+
+    def flush(self):
+        """Apply pending changes now, without waiting for the debounce."""
+        if self._stop.is_set():
+            return
+        with self._apply_lock:
+            with self._lock:
+                changed, self._pending = self._pending, set()
+            if changed and not self._stop.is_set():
+                self.on_change(changed)
+
+    def stop(self):
+        """Stop watching; returns once no change is being applied any more."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            # No timeout: an update still running would race whoever saves the caches next
+            self._thread.join()
+# ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
@@ -1,7 +1,131 @@
 # ur own AI, made by Mathus Souza, GitHub: https://github.com/PinkMath
-from ai_core.engine import FerretAI
+import os
+import sys
+import json
+import stat
+import time
+import argparse
+
+from ai_core.config import PERSONAS
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Ferret AI terminal. With -p, --file or piped stdin it answers once and exits.",
+    )
+    parser.add_argument("-p", "--prompt", help="ask one question and print the answer as plain text")
+    parser.add_argument("--persona", choices=list(PERSONAS), help="persona for one-shot mode (default: first)")
+    parser.add_argument("--file", help="send a file, like /file in the chat")
+    parser.add_argument("--mode", default="normal", choices=["normal", "summary", "explain", "refactor"],
+                        help="analysis mode for --file")
+    parser.add_argument("--no-cache", action="store_true", help="ignore a cached analysis of an unchanged file")
+
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument("--batch", metavar="PROMPTS", help="JSONL or CSV of prompts (fields: id, prompt, file, mode)")
+    batch.add_argument("--glob", help='analyse every matching file with --mode, e.g. "src/**/*.py"')
+    batch.add_argument("--out", help="append results as JSONL here and resume from it (default: stdout)")
+    batch.add_argument("--workers", type=int, help="concurrent requests (default: CONFIG batch_workers)")
+    batch.add_argument("--ordered", action="store_true", help="write results in input order, not as they finish")
+    return parser.parse_args()
+
+
+def stdin_piped():
+    # A pipe or a redirected file; TTYs and other devices are left alone
+    try:
+        mode = os.fstat(sys.stdin.fileno()).st_mode
+    except (OSError, ValueError):
+        return False
+    return stat.S_ISFIFO(mode) or stat.S_ISREG(mode)
+
+
+def build_prompt(args):
+    """One-shot prompt from --file, -p and piped stdin (in that order)."""
+    from ai_core.batch import item_prompt
+
+    piped = sys.stdin.read() if stdin_piped() else ""
+    item = {"mode": args.mode, "prompt": "\n\n".join(p for p in (args.prompt, piped) if p and p.strip())}
+    if args.file:
+        item["file"] = args.file
+    user_input, cache_id = item_prompt(item)
+    return user_input, None if args.no_cache else cache_id
+
+
+def one_shot(args):
+    from ai_core.oneshot import ask_once
+
+    try:
+        user_input, cache_id = build_prompt(args)
+    except OSError as e:
+        print(f"Could not read file: {e}", file=sys.stderr)
+        return 1
+    if not user_input.strip():
+        print("Nothing to ask: pass -p, --file or pipe text on stdin.", file=sys.stderr)
+        return 2
+
+    try:
+        ask_once(user_input, args.persona, cache_id=cache_id)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def batch(args):
+    from ai_core.batch import completed_ids, load_items, open_results, run_batch
+    from ai_core.utils import _print_progress
+
+    try:
+        items = load_items(args.batch, args.glob, args.mode)
+    except (OSError, ValueError) as e:
+        print(f"Could not load batch: {e}", file=sys.stderr)
+        return 1
+
+    if args.out:
+        done = completed_ids(args.out)
+        todo = [item for item in items if item["id"] not in done]
+        out = open_results(args.out)
+        if done:
+            print(f"Resuming: {len(items) - len(todo)} of {len(items)} already done.", file=sys.stderr)
+    else:
+        todo, out = items, sys.stdout
+    show_progress = args.out and sys.stderr.isatty()
+
+    failed, started = 0, time.time()
+    try:
+        results = run_batch(todo, args.workers, args.ordered, args.persona)
+        for count, record in enumerate(results, start=1):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()  # every finished item survives an interruption
+            failed += record["status"] != "ok"
+            if show_progress:
+                _print_progress(count, len(todo), started, "items", stream=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if show_progress and todo:
+            print(file=sys.stderr)
+
+    if failed:
+        print(f"{failed} of {len(todo)} items failed; run again to retry them.", file=sys.stderr)
+    return 1 if failed else 0
+
 
 def main():
+    args = parse_args()
+    if args.batch or args.glob:
+        try:
+            sys.exit(batch(args))
+        except KeyboardInterrupt:
+            sys.exit(130)
+
+    if args.prompt or args.file or stdin_piped():
+        try:
+            sys.exit(one_shot(args))
+        except KeyboardInterrupt:
+            sys.exit(130)
+
+    from ai_core.engine import FerretAI
+
     try:
         app = FerretAI()
         app.chat()